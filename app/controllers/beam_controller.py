@@ -1,6 +1,9 @@
 import sys
 import os
+import io
 import json
+import logging
+import numpy as np
 from typing import Dict, List
 
 # Adiciona o diretório raiz ao path para permitir imports absolutos
@@ -19,6 +22,10 @@ from app.engines.bar_selector import BarSelectorEngine
 from app.engines.optimizer import OptimizerEngine
 from app.models.entities import Beam
 
+# Saída do controlador (relatórios de lote/otimização).
+# Para silenciar: logging.getLogger("app.controllers").setLevel(logging.WARNING)
+logger = logging.getLogger(__name__)
+
 class BeamController:
     """
     Controlador Principal do Módulo de Vigas (PyViga).
@@ -29,82 +36,99 @@ class BeamController:
         # Inicializa os motores de cálculo com configurações padrão
         self.elu_engine = ELUDesignEngine(gamma_c=1.4, gamma_s=1.15)
         self.els_engine = ELSCheckerEngine(caa=2) # Default: Classe de Agressividade II
+        self.bar_selector = BarSelectorEngine() # Compartilhado por todas as vigas do lote
 
     def run_batch_analysis(self, json_file_path: str) -> Dict[str, Beam]:
         """
         Executa o fluxo completo para todas as vigas definidas no arquivo JSON.
         """
         if not os.path.exists(json_file_path):
-            print(f"[ERRO] Arquivo não encontrado: {json_file_path}")
+            logger.error(f"[ERRO] Arquivo não encontrado: {json_file_path}")
             return {}
 
-        print(f"--- Iniciando Processamento de Lote: {os.path.basename(json_file_path)} ---")
+        # Saída acumulada e emitida de uma vez ao final (uma escrita por lote)
+        out = io.StringIO()
+        print(f"--- Iniciando Processamento de Lote: {os.path.basename(json_file_path)} ---", file=out)
         
         # 1. Importação de Dados
         importer = PyLajeImporter(json_file_path)
         try:
             beams = importer.load_beams()
-            print(f"Importado(s) {len(beams)} viga(s) com sucesso.")
+            print(f"Importado(s) {len(beams)} viga(s) com sucesso.", file=out)
         except Exception as e:
-            print(f"ERRO FATAL na importação: {e}")
+            self._emit(out)
+            logger.error(f"ERRO FATAL na importação: {e}")
             return {}
 
-        results = {}
-
-        # 2. Loop de Processamento por Viga
+        # 2. Processamento por Viga (independentes entre si)
+        processed = {}
         for beam_id, beam in beams.items():
-            print(f"\n>> Processando Viga: {beam.id} ...")
+            print(f"\n>> Processando Viga: {beam.id} ...", file=out)
             
             try:
-                self._process_single_beam(beam)
-                results[beam_id] = beam
-                print(f"   [OK] Análise concluída para {beam.id}")
+                processed[beam_id] = self._process_single_beam(beam)
+                print(f"   [OK] Análise concluída para {beam.id}", file=out)
             except Exception as e:
-                print(f"   [ERRO] Falha ao processar {beam.id}: {e}")
-                # Em produção, usar logging
-                # import traceback
-                # traceback.print_exc()
+                print(f"   [ERRO] Falha ao processar {beam.id}: {e}", file=out)
+                logger.debug("Falha ao processar %s", beam.id, exc_info=True)
         
-        return results
+        self._emit(out)
+        
+        return processed
+
+    @staticmethod
+    def _emit(out: io.StringIO):
+        """Emite o relatório acumulado em uma única mensagem."""
+        text = out.getvalue()
+        if text:
+            logger.info(text.rstrip("\n"))
 
-    def _process_single_beam(self, beam: Beam):
+    def _process_single_beam(self, beam: Beam) -> Beam:
         """
         Executa o pipeline de cálculo para uma única viga.
+        Os resultados são gravados na própria viga, que também é retornada.
         """
         # PASSO A: Análise Estrutural (Matricial)
         solver = MatrixSolver(beam)
-        solver.solve()
+        solver.solve() # Também atualiza o espelho SoA (propriedades e esforços)
         
-        # PASSO B: Dimensionamento ELU
+        # PASSO B: Dimensionamento ELU (lote compilado sobre todos os vãos)
         self.elu_engine.run_design(beam)
+
+        selector = self.bar_selector
         
-        # PASSO C: Verificação ELS
-        self.els_engine.run_checks(beam)
+        designed = np.array([span.design_results is not None for span in beam.spans], dtype=bool)
+        spans = [span for span, ok in zip(beam.spans, designed) if ok]
+        if not spans: return beam
 
-        # PASSO D: Detalhamento Lógico Completo
-        selector = BarSelectorEngine()
+        # PASSO C: Armaduras Longitudinais de todos os vãos em lote
+        # Por vão: [Inferior (Positiva - Vão), Superior Esq., Superior Dir. (Negativas - Apoios)]
+        as_req = np.array([
+            [span.design_results.As_inf_vao,
+             span.design_results.As_sup_esq,
+             span.design_results.As_sup_dir]
+            for span in spans
+        ], dtype=np.float64)
+        bw = beam._span_bw[designed]
+        fck = beam._span_fck[designed]
+        is_top = np.array([False, True, True])
         
-        for span in beam.spans:
-            if not hasattr(span, "design_results"): continue
-            res = span.design_results
-            
-            # Recuperar FCK do material do vão
-            fck_val = span.material.fck
-            
-            # 1. Armadura Inferior (Positiva - Vão)
-            as_pos = res.get("As_inf_vao", 0.0)
-            det_pos = selector.select_longitudinal(as_pos, span.section.bw, fck_mpa=fck_val)
-            
-            # 2. Armadura Superior (Negativa - Apoios)
-            as_neg_esq = res.get("As_sup_esq", 0.0)
-            det_neg_esq = selector.select_longitudinal(as_neg_esq, span.section.bw, is_top=True, fck_mpa=fck_val)
-            
-            as_neg_dir = res.get("As_sup_dir", 0.0)
-            det_neg_dir = selector.select_longitudinal(as_neg_dir, span.section.bw, is_top=True, fck_mpa=fck_val)
+        long_options = selector.select_longitudinal_batch(
+            as_req.ravel(), np.repeat(bw, 3), np.tile(is_top, len(spans)), np.repeat(fck, 3)
+        )
+        
+        # Fissuração (ELS-W) de todos os vãos em lote
+        cracks = self.els_engine._check_cracking_batch(spans)
+        
+        # PASSO D: Passada única por vão (Verificação ELS + Detalhamento)
+        for k, span in enumerate(spans):
+            self.els_engine.check_span(span, cracks[k])
+
+            det_pos, det_neg_esq, det_neg_dir = long_options[3*k:3*k + 3]
             
-            # 3. Pele e Estribos (Mantém igual)
+            # Pele e Estribos
             det_pele = selector.select_skin_reinforcement(span.section.h, span.section.bw)
-            asw_req = res.get("Asw_s_req", 0.0)
+            asw_req = span.design_results.Asw_s_req
             det_shear = selector.select_stirrup(asw_req, span.section.bw, span.section.h)
             
             span.detailing_results = {
@@ -114,13 +138,15 @@ class BeamController:
                 "skin": det_pele,
                 "stirrups": det_shear
             }
+        
+        return beam
 
     def run_optimization(self, beam_id: str, beams_dict: Dict[str, Beam]):
         """
         Executa a rotina de otimização para uma viga específica.
         """
         if beam_id not in beams_dict:
-            print("Viga não encontrada na memória (Processe o arquivo primeiro).")
+            logger.warning("Viga não encontrada na memória (Processe o arquivo primeiro).")
             return
 
         beam = beams_dict[beam_id]
@@ -129,46 +155,46 @@ class BeamController:
         try:
             report = optimizer.optimize_beam(beam)
         except Exception as e:
-            print(f"Erro crítico durante otimização: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Erro crítico durante otimização: {e}")
             return
         
-        print("\n" + "="*60)
-        print(f"RELATÓRIO DE OTIMIZAÇÃO: {beam.id}")
-        print("="*60)
+        out = io.StringIO()
+        print("\n" + "="*60, file=out)
+        print(f"RELATÓRIO DE OTIMIZAÇÃO: {beam.id}", file=out)
+        print("="*60, file=out)
         
         if "error" in report:
-            print(f"Erro: {report['error']}")
+            print(f"Erro: {report['error']}", file=out)
+            self._emit(out)
             return
 
         orig = report["original"]
         best = report["best"]
         
-        print(f"{'CENÁRIO':<15} | {'SEÇÃO (cm)':<12} | {'AÇO (kg)':<10} | {'CUSTO EST.(R$)':<15}")
-        print("-" * 60)
+        print(f"{'CENÁRIO':<15} | {'SEÇÃO (cm)':<12} | {'AÇO (kg)':<10} | {'CUSTO EST.(R$)':<15}", file=out)
+        print("-" * 60, file=out)
         
         # Tratamento seguro caso a original tenha falhado na otimização (recalculo)
         if orig:
             orig_h = orig['h']
             orig_steel = orig.get('steel_kg', 'N/A')
             orig_cost = orig.get('cost', 'N/A')
-            print(f"{'ATUAL':<15} | {beam.spans[0].section.bw}x{orig_h:<9} | {orig_steel:<10} | R$ {orig_cost}")
+            print(f"{'ATUAL':<15} | {beam.spans[0].section.bw}x{orig_h:<9} | {orig_steel:<10} | R$ {orig_cost}", file=out)
         else:
-            print(f"{'ATUAL':<15} | Falha ao recalcular original")
+            print(f"{'ATUAL':<15} | Falha ao recalcular original", file=out)
             
-        print(f"{'OTIMIZADO':<15} | {beam.spans[0].section.bw}x{best['h']:<9} | {best['steel_kg']:<10} | R$ {best['cost']:.2f}")
-        print("-" * 60)
+        print(f"{'OTIMIZADO':<15} | {beam.spans[0].section.bw}x{best['h']:<9} | {best['steel_kg']:<10} | R$ {best['cost']:.2f}", file=out)
+        print("-" * 60, file=out)
         
-        if orig and isinstance(orig.get('cost'), (int, float)):
+        print(f"RECOMENDAÇÃO: {report['recommendation']}", file=out)
+        # Todo resultado do otimizador tem 'cost' numérico (falhas usam custo penalizado)
+        if orig:
             economy = orig['cost'] - best['cost']
-            print(f"RECOMENDAÇÃO: {report['recommendation']}")
             if economy > 0:
-                print(f"ECONOMIA TOTAL: R$ {economy:.2f}")
-        else:
-            print(f"RECOMENDAÇÃO: {report['recommendation']}")
+                print(f"ECONOMIA TOTAL: R$ {economy:.2f}", file=out)
             
-        print("="*60)
+        print("="*60, file=out)
+        self._emit(out)
 
     def export_pillar_loads(self, beams: Dict[str, Beam]):
         """
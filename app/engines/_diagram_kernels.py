@@ -0,0 +1,28 @@
+"""
+Kernel compilado (Numba) da discretização dos diagramas V(x) / M(x).
+Mesma formulação de BeamPlotter.diagram_points, com laço explícito por vão e por ponto:
+só compensa para discretizações finas (milhares de pontos por viga).
+"""
+from app.engines._jit import njit, prange
+
+@njit(parallel=True, cache=True, fastmath=True)
+def diagram_points(x_start, L, q, V_esq, M_esq, n_pts, x_out, v_out, m_out):
+    """
+    Grava x, V(x) = V_esq - q*x e M(x) = M_esq + V_esq*x - q*x²/2 de cada vão s
+    nas posições [s*n_pts, (s+1)*n_pts) de x_out, v_out e m_out.
+    Abscissas locais como np.linspace(0, L, n_pts): k * L/(n_pts-1), último ponto = L.
+    """
+    n = L.shape[0]
+    for s in prange(n):
+        Ls = L[s]
+        qs = q[s]
+        Vs = V_esq[s]
+        Ms = M_esq[s]
+        x0 = x_start[s]
+        step = Ls / (n_pts - 1)
+        base = s * n_pts
+        for k in range(n_pts):
+            xl = Ls if k == n_pts - 1 else k * step
+            x_out[base + k] = x0 + xl
+            v_out[base + k] = Vs - qs * xl
+            m_out[base + k] = Ms + Vs * xl - 0.5 * qs * xl * xl
@@ -0,0 +1,112 @@
+"""
+Kernels compilados (Numba) do dimensionamento ELU.
+Única implementação da flexão e do cisalhamento (chamada por ELUDesignEngine.run_design),
+com laços explícitos sobre arrays de vãos (nopython).
+"""
+from math import sqrt
+from app.engines._jit import njit, prange
+
+# Equação de equilíbrio em beta_x = x/d:  0.272 * beta_x^2 - 0.68 * beta_x + Kmd = 0
+_BETA_A = 2 * 0.272          # 2a
+_BETA_DISC_COEF = 0.68**2    # b²
+_BETA_FOURAC = 4 * 0.272     # 4a (discriminante = b² - 4a*Kmd)
+
+# Colunas do array de saída de _design_batch
+OUT_AS_SUP_ESQ = 0
+OUT_AS_SUP_DIR = 1
+OUT_AS_INF_VAO = 2
+OUT_MD_MAX = 3
+OUT_V_SD = 4
+OUT_ASW_S_REQ = 5
+OUT_BIELA_OK = 6
+N_OUT = 7
+
+# Assinatura explícita: compilação antecipada na importação (sem custo no 1º vão)
+@njit('float64(float64, float64, float64, float64, float64)', cache=True, fastmath=True)
+def _calc_As(Md_kNm, b_cm, d_cm, fcd, fyd):
+    """
+    As para seção retangular (Domínios 2, 3).
+    """
+    if Md_kNm <= 0.01: return 0.0
+
+    Md_kNcm = Md_kNm * 100
+
+    # Equação adimensional (Kmd)
+    # Md = 0.68 * b * x * fcd * (d - 0.4x)
+    # Kmd = Md / (b * d^2 * fcd)
+    kmd = Md_kNcm / (b_cm * (d_cm**2) * fcd)
+
+    # Limite entre domínios 3 e 4 (x/d = 0.45 para fck <= 50): Kmd limite approx 0.251
+    # Domínio 4: penalidade estimativa em vez de armadura dupla (o aviso é emitido pelo chamador)
+    if kmd > 0.251:
+        return (Md_kNcm / (0.9 * d_cm * fyd)) * 1.5
+
+    disc = _BETA_DISC_COEF - _BETA_FOURAC * kmd
+    if disc < 0: return 999.0 # Impossível
+
+    # Solução exata da equação de equilíbrio em beta_x; braço de alavanca z = d * (1 - 0.4 * x/d)
+    beta_x = (0.68 - sqrt(disc)) / _BETA_A
+    z = d_cm * (1 - 0.4 * beta_x)
+    return Md_kNcm / (z * fyd)
+
+@njit(parallel=True, cache=True, fastmath=True)
+def _design_batch(b_arr, h_arr, fck_arr, fcd_arr, fyd_arr, ml, mr, vl, vr, q, L,
+                  gamma_c, gamma_f, out, out_kmd):
+    """
+    Flexão + Cisalhamento de N vãos independentes.
+    out: (N, N_OUT) com as colunas OUT_*; out_kmd: (N, 3) Kmd em [Esq, Vão, Dir].
+    """
+    n = b_arr.shape[0]
+    for i in prange(n):
+        b = b_arr[i]
+        h = h_arr[i]
+        d = h - 4.0
+        fck = fck_arr[i]
+        fcd = fcd_arr[i]
+        fyd = fyd_arr[i]
+
+        # --- Flexão ---
+        Md_neg_esq = abs(ml[i]) * gamma_f
+        Md_neg_dir = abs(mr[i]) * gamma_f
+        # Positivo no vão: M_isostático (qL²/8) menos a média dos momentos de apoio
+        M0 = (q[i] * L[i]**2) / 8
+        Md_pos_vao = max(0.0, (M0 - (abs(ml[i]) + abs(mr[i]))/2)) * gamma_f
+
+        den = b * (d**2) * fcd
+        out_kmd[i, 0] = Md_neg_esq * 100 / den
+        out_kmd[i, 1] = Md_pos_vao * 100 / den
+        out_kmd[i, 2] = Md_neg_dir * 100 / den
+
+        as_sup_esq = _calc_As(Md_neg_esq, b, d, fcd, fyd)
+        as_sup_dir = _calc_As(Md_neg_dir, b, d, fcd, fyd)
+        as_inf_vao = _calc_As(Md_pos_vao, b, d, fcd, fyd)
+
+        # Armadura mínima (NBR 6118 Tabela 17.3.5; rho_min = 0.15% para fck 25)
+        as_min = 0.0015 * b * h
+
+        out[i, OUT_AS_SUP_ESQ] = max(as_sup_esq, as_min) if Md_neg_esq > 0.1 else 0.0
+        out[i, OUT_AS_SUP_DIR] = max(as_sup_dir, as_min) if Md_neg_dir > 0.1 else 0.0
+        out[i, OUT_AS_INF_VAO] = max(as_inf_vao, as_min)
+        out[i, OUT_MD_MAX] = max(Md_neg_esq, Md_neg_dir, Md_pos_vao)
+
+        # --- Cisalhamento (Modelo I) ---
+        Vd_max = max(abs(vl[i]), abs(vr[i])) * gamma_f
+        fck_23 = fck ** (2/3)
+        fctd = (0.21 * fck_23) / gamma_c / 10.0
+
+        # Biela comprimida (V_Rd2)
+        alpha_v2 = 1 - (fck / 250)
+        V_rd2 = 0.27 * alpha_v2 * fcd * b * d
+        out[i, OUT_BIELA_OK] = 0.0 if Vd_max > V_rd2 else 1.0
+
+        # V_sw = V_sd - V_c0; estribo vertical com fyd limitado a 435 MPa
+        V_c = 0.6 * fctd * b * d
+        V_sw = max(0.0, Vd_max - V_c)
+        Asw_s_calc = V_sw / (0.9 * d * 43.5)
+
+        # Mínima: rho_sw_min = 0.2 * fct,m / fywk (fywk 500 MPa)
+        fctm = 0.3 * fck_23 / 10.0
+        Asw_s_min = (0.2 * fctm / 50.0) * b
+
+        out[i, OUT_V_SD] = Vd_max
+        out[i, OUT_ASW_S_REQ] = max(Asw_s_calc, Asw_s_min)
@@ -0,0 +1,36 @@
+"""
+Compatibilidade com Numba (dependência opcional).
+Se o Numba estiver instalado, os kernels numéricos são compilados (nopython).
+Caso contrário, os mesmos kernels rodam como Python puro, com resultado idêntico.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        # Suporta tanto @njit quanto @njit(cache=True, ...) e @njit('assinatura', ...)
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+def prefer_threadsafe_layer():
+    """
+    Prioriza a camada de threads OpenMP dos kernels paralelos (se disponível).
+    Na GUI os kernels rodam pela primeira vez numa QThread (thread não criada pelo Python);
+    com a camada TBB isso trava o encerramento do processo.
+    Não altera nada se o usuário já escolheu a camada por variável de ambiente.
+    """
+    import os
+    if not NUMBA_AVAILABLE:
+        return
+    if os.environ.get("NUMBA_THREADING_LAYER") or os.environ.get("NUMBA_THREADING_LAYER_PRIORITY"):
+        return
+    import numba
+    numba.config.THREADING_LAYER_PRIORITY = ["omp", "tbb", "workqueue"]
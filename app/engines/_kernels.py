@@ -0,0 +1,98 @@
+"""
+Kernels compilados (Numba) da Análise Matricial (MatrixSolver).
+Mesma formulação do Método da Rigidez Direta, escrita com aritmética escalar
+sobre arrays de propriedades dos vãos (nopython, sem objetos Python no laço).
+Convenção: o vão s liga os nós s e s+1 -> DOFs [2s, 2s+1, 2s+2, 2s+3].
+"""
+from app.engines._jit import njit
+
+@njit(cache=True)
+def assemble_stiffness(K, k_locals, EI, L, reduced_idx):
+    """
+    Monta K do sistema reduzido (n_free, n_free) a partir de EI (kNm²) e L (m) por vão.
+    reduced_idx[g]: posição do DOF global g no sistema reduzido (-1 = restringido, descartado).
+    Grava também as matrizes locais k_locals (n_spans, 4, 4). K deve vir zerada.
+    """
+    n = L.shape[0]
+    for s in range(n):
+        Ls = L[s]
+        k11 = 12.0 * EI[s] / Ls**3
+        k12 = 6.0 * EI[s] / Ls**2
+        k22 = 4.0 * EI[s] / Ls
+        k24 = 2.0 * EI[s] / Ls
+
+        k = k_locals[s]
+        k[0, 0] = k11;  k[0, 1] = k12;  k[0, 2] = -k11; k[0, 3] = k12
+        k[1, 0] = k12;  k[1, 1] = k22;  k[1, 2] = -k12; k[1, 3] = k24
+        k[2, 0] = -k11; k[2, 1] = -k12; k[2, 2] = k11;  k[2, 3] = -k12
+        k[3, 0] = k12;  k[3, 1] = k24;  k[3, 2] = -k12; k[3, 3] = k22
+
+        d0 = 2 * s
+        for i in range(4):
+            ri = reduced_idx[d0 + i]
+            if ri < 0:
+                continue
+            for j in range(4):
+                rj = reduced_idx[d0 + j]
+                if rj >= 0:
+                    K[ri, rj] += k[i, j]
+
+@njit(cache=True)
+def assemble_loads(F, f_fixed, L, q, reduced_idx):
+    """
+    Monta F do sistema reduzido a partir de L (m) e q (kN/m) por vão.
+    Grava as reações de engaste perfeito f_fixed (n_spans, 4). F deve vir zerado.
+    """
+    n = L.shape[0]
+    for s in range(n):
+        Ls = L[s]
+        # Reações de Engaste Perfeito (REP): V = qL/2, M = qL²/12
+        r_v = q[s] * Ls / 2
+        r_m = q[s] * Ls**2 / 12
+        f_fixed[s, 0] = r_v
+        f_fixed[s, 1] = r_m
+        f_fixed[s, 2] = r_v
+        f_fixed[s, 3] = -r_m
+
+        d0 = 2 * s
+        for i in range(4):
+            ri = reduced_idx[d0 + i]
+            if ri >= 0:
+                # F_eq = -REP (carga nodal equivalente)
+                F[ri] -= f_fixed[s, i]
+
+@njit(cache=True)
+def assemble_system(K, F, k_locals, f_fixed, EI, L, q, reduced_idx):
+    """Monta K e F do sistema reduzido (ver assemble_stiffness / assemble_loads)."""
+    assemble_stiffness(K, k_locals, EI, L, reduced_idx)
+    assemble_loads(F, f_fixed, L, q, reduced_idx)
+
+@njit(cache=True)
+def internal_forces(k_locals, f_fixed, u, out):
+    """
+    Esforços de extremidade de cada vão: f = k_local · u_elem + REP.
+    Usa só os 4 coeficientes distintos da matriz local (a = 12EI/L³, b = 6EI/L²,
+    c = 4EI/L, d = 2EI/L), em aritmética escalar (sem np.dot / arrays temporários).
+    out (n_spans, 4): [V_esq, M_esq, V_dir, M_dir] na Convenção de Resistência.
+    """
+    n = k_locals.shape[0]
+    for s in range(n):
+        d0 = 2 * s
+        a = k_locals[s, 0, 0]
+        b = k_locals[s, 0, 1]
+        c = k_locals[s, 1, 1]
+        d = k_locals[s, 1, 3]
+        u0 = u[d0]
+        u1 = u[d0 + 1]
+        u2 = u[d0 + 2]
+        u3 = u[d0 + 3]
+
+        f0 = (a*u0 + b*u1 - a*u2 + b*u3) + f_fixed[s, 0]
+        f1 = (b*u0 + c*u1 - b*u2 + d*u3) + f_fixed[s, 1]
+        f2 = (-a*u0 - b*u1 + a*u2 - b*u3) + f_fixed[s, 2]
+        f3 = (b*u0 + d*u1 - b*u2 + c*u3) + f_fixed[s, 3]
+
+        out[s, 0] = f0
+        out[s, 1] = f1
+        out[s, 2] = -f2
+        out[s, 3] = -f3
@@ -1,8 +1,29 @@
-import math
+from math import pi, ceil
+import functools
+import numpy as np
 from dataclasses import dataclass
 from typing import List, Optional
+from app.engines._jit import njit
 
-@dataclass
+# Bitolas comerciais (mm)
+LONGITUDINAL_BARS = np.array([8.0, 10.0, 12.5, 16.0, 20.0, 25.0], dtype=np.float64)
+TRANSVERSAL_BARS = (5.0, 6.3, 8.0, 10.0)
+
+def _bar_area(phi_mm: float) -> float:
+    """Área da seção de uma barra (cm²)."""
+    return 0.25 * pi * (phi_mm * 0.1)**2
+
+# Tabelas bitola -> área (cm²), avaliadas uma única vez na importação
+LONGITUDINAL_AREAS = tuple(_bar_area(phi) for phi in LONGITUDINAL_BARS.tolist())
+TRANSVERSAL_AREAS = tuple(_bar_area(phi) for phi in TRANSVERSAL_BARS)
+_TRANSVERSAL_BARS_ARR = np.array(TRANSVERSAL_BARS, dtype=np.float64)
+_TRANSVERSAL_AREAS_ARR = np.array(TRANSVERSAL_AREAS, dtype=np.float64)
+
+# Espaçamento horizontal mínimo entre barras e estribo estimado (mm)
+_AH_MIN = 20.0
+_ESTRIBO_EST = 5.0
+
+@dataclass(slots=True)
 class BarOption:
     diameter_mm: float
     count: int
@@ -11,26 +32,76 @@ class BarOption:
     status: str = "OK"
     anchorage_length_cm: float = 0.0 # Novo campo: lb_nec
 
-@dataclass
+@dataclass(slots=True)
 class StirrupOption:
     diameter_mm: float
     spacing_cm: float
     legs: int = 2
     status: str = "OK"
 
+# Assinatura explícita: compilado (ou carregado do cache) já na importação
+# Sem fastmath: a seleção avulsa e a em lote devem dar o mesmo resultado bit a bit
+@njit('Tuple((float64, int64, float64))(float64, float64, float64, float64, float64, float64[::1])',
+      cache=True)
+def _select_longitudinal_core(as_req, bw_mm, cover_mm, estribo_est, ah_min, phis):
+    """
+    Kernel da escolha de bitola: menor sobre-armadura que cabe em uma camada.
+    Retorna (phi, n, area_total). phi = 0.0 indica que nenhuma bitola coube.
+    """
+    width_available = bw_mm - 2.0 * (cover_mm + estribo_est)
+
+    # best_n == 0: nenhuma bitola coube ainda
+    best_phi = 0.0
+    best_n = 0
+    best_area = 0.0
+    min_overdesign = 0.0
+
+    for i in range(phis.shape[0]):
+        phi = phis[i]
+        area_bar = 0.25 * pi * (phi * 0.1)**2
+        n = max(2, int(ceil(as_req / area_bar)))
+
+        space_required = (n * phi) + ((n - 1) * ah_min)
+
+        if space_required <= width_available:
+            area_total = n * area_bar
+            overdesign = area_total - as_req
+
+            if best_n == 0 or overdesign < min_overdesign:
+                min_overdesign = overdesign
+                best_phi = phi
+                best_n = n
+                best_area = area_total
+
+    return best_phi, best_n, best_area
+
+@njit('void(float64[::1], float64[::1], float64, float64, float64, float64[::1], '
+      'float64[::1], int64[::1], float64[::1])', cache=True)
+def _select_longitudinal_many(as_req, bw_mm, cover_mm, estribo_est, ah_min, phis,
+                              out_phi, out_n, out_area):
+    """_select_longitudinal_core sobre N seleções independentes (uma única chamada compilada)."""
+    for k in range(as_req.shape[0]):
+        out_phi[k], out_n[k], out_area[k] = _select_longitudinal_core(
+            as_req[k], bw_mm[k], cover_mm, estribo_est, ah_min, phis)
+
 class BarSelectorEngine:
     """
     Responsável por converter Área de Aço Teórica em Detalhamento Comercial.
     """
 
     def __init__(self):
-        self.longitudinal_bars = [8.0, 10.0, 12.5, 16.0, 20.0, 25.0]
-        self.transversal_bars = [5.0, 6.3, 8.0, 10.0]
+        self.longitudinal_bars = LONGITUDINAL_BARS
+        self.transversal_bars = TRANSVERSAL_BARS
+        self._long_areas = LONGITUDINAL_AREAS
+        self._trans_areas = TRANSVERSAL_AREAS
 
-    def _calc_anchorage(self, phi_mm: float, fck_mpa: float = 25.0, condition: str = "good") -> float:
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _calc_anchorage(phi_mm: float, fck_mpa: float = 25.0, condition: str = "good") -> float:
         """
         Calcula comprimento de ancoragem básico (lb) conforme NBR 6118.
         condition: 'good' (boa aderência) ou 'bad' (má aderência)
+        Memoizado: há poucas combinações distintas de (bitola, fck, aderência).
         """
         # fbd = eta1 * eta2 * eta3 * fctd
         # eta1 = 2.25 (nervurado)
@@ -60,47 +131,52 @@ class BarSelectorEngine:
         if as_req <= 0.01:
             return BarOption(0, 0, 0, 0, status="Dispensado")
 
-        best_option = None
-        min_overdesign = float('inf')
-        
-        ah_min = 20.0 
-        estribo_est = 5.0
-        bw_mm = bw_cm * 10
-        width_available = bw_mm - 2*(cover_mm + estribo_est)
+        phi, n, area_total = _select_longitudinal_core(
+            as_req, bw_cm * 10, cover_mm, _ESTRIBO_EST, _AH_MIN, self.longitudinal_bars
+        )
+        return self._bar_option(phi, n, area_total, is_top, fck_mpa)
+
+    def select_longitudinal_batch(self, as_req: np.ndarray, bw_cm: np.ndarray, is_top: np.ndarray,
+                                  fck: np.ndarray, cover_mm: float = 25.0) -> List[BarOption]:
+        """
+        Versão em lote de select_longitudinal: resolve N seleções independentes
+        (ex: positiva + negativas de todos os vãos) em uma única chamada ao kernel.
+        Todos os arrays são 1D com o mesmo comprimento N.
+        """
+        as_req = np.ascontiguousarray(as_req, dtype=np.float64).ravel()
+        bw_mm = np.ascontiguousarray(bw_cm, dtype=np.float64).ravel() * 10
+        is_top = np.asarray(is_top, dtype=bool).ravel().tolist()
+        fck = np.asarray(fck, dtype=np.float64).ravel().tolist()
+
+        n_sel = as_req.shape[0]
+        phis, counts, areas = np.empty(n_sel), np.empty(n_sel, dtype=np.int64), np.empty(n_sel)
+        _select_longitudinal_many(as_req, bw_mm, float(cover_mm), _ESTRIBO_EST, _AH_MIN,
+                                  self.longitudinal_bars, phis, counts, areas)
+
+        return [BarOption(0, 0, 0, 0, status="Dispensado") if a <= 0.01
+                else self._bar_option(phi, n, area, top, f)
+                for a, phi, n, area, top, f in zip(as_req.tolist(), phis.tolist(), counts.tolist(),
+                                                   areas.tolist(), is_top, fck)]
+
+    def _bar_option(self, phi: float, n: int, area_total: float, is_top: bool, fck_mpa: float) -> BarOption:
+        """Monta o BarOption a partir do resultado do kernel (n = 0: nenhuma bitola coube)."""
+        if n == 0:
+            return BarOption(0, 0, 0, 0, status="Erro: Não cabe (Camada Dupla nec.)")
 
         # Condição de aderência:
         # Topo = má aderência (geralmente), Fundo = boa aderência
         bond_cond = "bad" if is_top else "good"
 
-        for phi in self.longitudinal_bars:
-            area_bar = math.pi * ((phi/10)/2)**2
-            n = math.ceil(as_req / area_bar)
-            if n < 2: n = 2 
-            
-            space_required = (n * phi) + ((n - 1) * ah_min)
-            
-            if space_required <= width_available:
-                area_total = n * area_bar
-                overdesign = area_total - as_req
-                
-                if overdesign < min_overdesign:
-                    min_overdesign = overdesign
-                    
-                    # Calcula Ancoragem para essa bitola
-                    lb = self._calc_anchorage(phi, fck_mpa, bond_cond)
-                    
-                    best_option = BarOption(
-                        diameter_mm=phi,
-                        count=n,
-                        area_provided_cm2=area_total,
-                        status="OK",
-                        anchorage_length_cm=round(lb, 1)
-                    )
-        
-        if best_option:
-            return best_option
-        else:
-            return BarOption(0, 0, 0, 0, status="Erro: Não cabe (Camada Dupla nec.)")
+        # Calcula Ancoragem para a bitola escolhida
+        lb = self._calc_anchorage(phi, fck_mpa, bond_cond)
+
+        return BarOption(
+            diameter_mm=phi,
+            count=n,
+            area_provided_cm2=area_total,
+            status="OK",
+            anchorage_length_cm=round(lb, 1)
+        )
 
     def select_skin_reinforcement(self, h_cm: float, bw_cm: float) -> BarOption:
         """
@@ -113,8 +189,8 @@ class BarSelectorEngine:
         As_pele_face = As_pele_total / 2
         
         phi = 8.0 
-        area_bar = math.pi * ((phi/10)/2)**2
-        n_face = math.ceil(As_pele_face / area_bar)
+        area_bar = self._long_areas[0] # Ø8.0
+        n_face = ceil(As_pele_face / area_bar)
         if n_face < 2: n_face = 2
         
         return BarOption(
@@ -125,17 +201,19 @@ class BarSelectorEngine:
         )
 
     def select_stirrup(self, asw_s_req: float, bw_cm: float, h_cm: float) -> StirrupOption:
+        """
+        Primeira bitola (da menor para a maior) cujo espaçamento adotado é >= 5 cm.
+        Todas as bitolas são avaliadas de uma vez (seleção por máscara, sem laço).
+        """
         if asw_s_req <= 0.0001: asw_s_req = 0.001 
 
-        for phi in self.transversal_bars:
-            area_leg = math.pi * ((phi/10)/2)**2
-            area_total = 2 * area_leg 
-            s_calc = area_total / asw_s_req 
-            
-            s_max = min(0.6 * (h_cm - 4), 30.0)
-            s_adopt = math.floor(min(s_calc, s_max))
-            
-            if s_adopt >= 5.0:
-                return StirrupOption(phi, s_adopt, 2, "OK")
-                
-        return StirrupOption(0, 0, 2, "Erro: Espaçamento < 5cm")
\ No newline at end of file
+        s_calc = 2 * _TRANSVERSAL_AREAS_ARR / asw_s_req # 2 pernas
+        s_max = min(0.6 * (h_cm - 4), 30.0)
+        s_adopt = np.floor(np.minimum(s_calc, s_max))
+
+        valid = s_adopt >= 5.0
+        if not valid.any():
+            return StirrupOption(0, 0, 2, "Erro: Espaçamento < 5cm")
+
+        idx = int(np.argmax(valid)) # Primeiro True
+        return StirrupOption(float(_TRANSVERSAL_BARS_ARR[idx]), int(s_adopt[idx]), 2, "OK")
@@ -1,10 +1,12 @@
-import math
+import logging
 import numpy as np
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List
 from app.models.entities import Beam, BeamSpan, MaterialType
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+@dataclass(slots=True)
 class ServiceabilityResult:
     """DTO para armazenar resultados da verificação ELS."""
     wk_calc: float        # Abertura de fissura calculada (mm)
@@ -44,102 +46,99 @@ class ELSCheckerEngine:
         Executa as verificações para todos os vãos da viga.
         Os resultados são anexados ao objeto span.
         """
+        spans = []
         for span in beam.spans:
             # Recuperar dados do Design ELU (As calculado)
-            if not hasattr(span, "design_results"):
-                print(f"AVISO: Viga {beam.id} não possui dimensionamento ELU. Pulando ELS.")
+            if span.design_results is None:
+                logger.warning("AVISO: Viga %s não possui dimensionamento ELU. Pulando ELS.", beam.id)
                 continue
-            
-            # 1. Verificar Fissuração
-            res_crack = self._check_cracking(span)
-            
-            # 2. Verificar Flechas (Simplificado)
-            res_deflection = self._check_deflection(span)
-            
-            # Armazenar
-            span.els_results = ServiceabilityResult(
-                wk_calc=res_crack["wk"],
-                wk_limit=res_crack["limit"],
-                deflection_inst=res_deflection["inst"],
-                deflection_total=res_deflection["total"],
-                deflection_limit=res_deflection["limit"],
-                status_crack=res_crack["status"],
-                status_deflection=res_deflection["status"]
-            )
-
-    def _check_cracking(self, span: BeamSpan) -> Dict:
+            spans.append(span)
+
+        # Fissuração de todos os vãos em uma passada vetorizada
+        cracks = self._check_cracking_batch(spans)
+        
+        for span, res_crack in zip(spans, cracks):
+            self.check_span(span, res_crack)
+
+    def check_span(self, span: BeamSpan, res_crack: Dict):
         """
-        Calcula a abertura característica de fissuras (wk).
-        Baseado na NBR 6118 Item 17.3.3.2.
+        Verifica um único vão (Fissuração + Flecha) e anexa o resultado em span.els_results.
+        Ponto de entrada usado pelo controlador na passada única por vão.
+        :param res_crack: Resultado de fissuração do vão, calculado em lote por _check_cracking_batch
         """
-        # Dados Geométricos e Materiais
-        h = span.section.h
-        b = span.section.bw
-        d = h - 4.0 # Altura útil estimada
-        alpha_e = 10.0 # Relação Es/Ecs (simplificação padrão NBR, ou calc: Es/Ecs)
-        Es = 21000.0 # kN/cm² (210 GPa)
-        
-        # Recuperar As efetivo (usando o calculado no ELU para o vão - Momento Positivo)
-        # Nota: Fissuração crítica geralmente é no meio do vão (fundo) ou apoios (topo).
-        # Aqui verificaremos o VÃO (Região de momento positivo).
-        As_adopt = span.design_results.get("As_inf_vao", 0.0)
-        
-        # Se não há armadura (ex: momento muito baixo), não há fissura de tração
-        if As_adopt <= 0.001:
-            return {"wk": 0.0, "limit": self.crack_limits[self.caa], "status": "OK"}
+        # Verificar Flechas (Simplificado)
+        res_deflection = self._check_deflection(span)
+        
+        # Armazenar
+        span.els_results = ServiceabilityResult(
+            wk_calc=res_crack["wk"],
+            wk_limit=res_crack["limit"],
+            deflection_inst=res_deflection["inst"],
+            deflection_total=res_deflection["total"],
+            deflection_limit=res_deflection["limit"],
+            status_crack=res_crack["status"],
+            status_deflection=res_deflection["status"]
+        )
+
+    def _check_cracking_batch(self, spans: List[BeamSpan]) -> List[Dict]:
+        """
+        Abertura característica de fissuras (wk) no Estádio II - NBR 6118 Item 17.3.3.2.
+        Verifica o VÃO (região de momento positivo, armadura de fundo), com arrays
+        de um elemento por vão. Retorna um dict por vão.
+        """
+        if not spans: return []
+
+        h = np.array([span.section.h for span in spans], dtype=np.float64)
+        b = np.array([span.section.bw for span in spans], dtype=np.float64)
+        d = h - 4.0
+        alpha_e = 10.0
+        Es = 21000.0 # kN/cm²
+
+        As = np.array([span.design_results.As_inf_vao for span in spans], dtype=np.float64)
+        Md_max = np.array([span.design_results.Md_max for span in spans], dtype=np.float64)
+        fctm = np.array([span.material.fctm for span in spans], dtype=np.float64)
+
+        # Sem armadura -> sem fissura de tração (evita divisão por zero no cálculo)
+        cracked = As > 0.001
+        As_c = np.where(cracked, As, 1.0)
 
         # Momento de Serviço (Combinação Quase Permanente - ELS-QP)
-        # M_serv aprox M_d / 1.4 (Desfazer majoração ELU) * Fator redução carga (psi2)
-        # Simplificação conservadora: M_serv = Md_max / 1.4
-        Md_max = span.design_results.get("Md_max", 0.0)
-        M_serv = (Md_max / 1.4) * 100 # Converter kNm para kNcm
-        
+        # Simplificação conservadora: M_serv = Md_max / 1.4 (desfaz a majoração ELU)
+        M_serv = (Md_max / 1.4) * 100 # kNcm
+
         # 1. Linha Neutra no Estádio II (x_II)
         # Eq: (b * x^2)/2 + alpha_e * As * (x - d) = 0
-        # A * x^2 + B * x + C = 0
-        A_eq = b / 2
-        B_eq = alpha_e * As_adopt
-        C_eq = -alpha_e * As_adopt * d
-        
-        delta = B_eq**2 - 4 * A_eq * C_eq
-        x_II = (-B_eq + math.sqrt(delta)) / (2 * A_eq)
-        
+        # Raiz positiva em forma fechada: x = (aAs/b) * (sqrt(1 + 2*b*d/aAs) - 1)
+        a_As = alpha_e * As_c
+        x_II = (a_As / b) * (np.sqrt(1 + 2 * b * d / a_As) - 1)
+
         # 2. Inércia no Estádio II (I_II)
-        I_II = (b * x_II**3)/3 + alpha_e * As_adopt * (d - x_II)**2
-        
+        I_II = (b * x_II**3)/3 + a_As * (d - x_II)**2
+
         # 3. Tensão na Armadura (sigma_s)
-        # sigma_s = alpha_e * (M_serv * (d - x) / I_II)
-        sigma_s = alpha_e * (M_serv * (d - x_II) / I_II) # kN/cm²
-        
-        # 4. Cálculo de wk (Fórmula NBR 6118)
-        # wk = (phi / 12.5 * eta1) * (sigma_s / Es) * (3 * sigma_s / fctm)
-        
-        # Estimativa de diâmetro da barra (phi) - Pode vir do detalhamento futuro
-        # Vamos assumir uma barra média de 10mm ou 12.5mm se As for alto
-        phi = 1.0 # 10mm em cm
-        if As_adopt > 5.0: phi = 1.25
-        if As_adopt > 10.0: phi = 1.6
-        
-        eta1 = 2.25 # Coeficiente de aderência (Barra nervurada)
-        
-        fctm = 0.3 * (span.material.fck ** (2/3)) / 10.0 # kN/cm²
-        
-        # Termo de tirante (acurácia da norma)
-        # A norma pede o menor valor entre w1 e w2. Usaremos a fórmula base w1.
+        sigma_s = alpha_e * (M_serv * (d - x_II) / I_II)
+
+        # 4. wk (NBR 6118): wk = (phi / 12.5 * eta1) * (sigma_s / Es) * (3 * sigma_s / fctm)
+        # Bitola estimada pelo As (10mm; 12.5mm se As > 5; 16mm se As > 10)
+        phi = np.where(As > 10.0, 1.6, np.where(As > 5.0, 1.25, 1.0))
+        eta1 = 2.25
+
         term_1 = (phi / (12.5 * eta1))
         term_2 = (sigma_s / Es)
-        term_3 = max(0.6 * sigma_s / fctm, 3 * sigma_s / fctm) # Proteção num
-        
-        wk_cm = term_1 * term_2 * term_3
-        wk_mm = wk_cm * 10.0
-        
+        term_3 = np.maximum(0.6 * sigma_s / fctm, 3 * sigma_s / fctm)
+
+        wk_mm = np.where(cracked, term_1 * term_2 * term_3 * 10.0, 0.0)
+
         limit = self.crack_limits.get(self.caa, 0.3)
-        
-        return {
-            "wk": round(wk_mm, 3),
-            "limit": limit,
-            "status": "OK" if wk_mm <= limit else "FALHA"
-        }
+
+        return [
+            {
+                "wk": round(float(wk), 3),
+                "limit": limit,
+                "status": "OK" if wk <= limit else "FALHA"
+            }
+            for wk in wk_mm
+        ]
 
     def _check_deflection(self, span: BeamSpan) -> Dict:
         """
@@ -158,7 +157,7 @@ class ELSCheckerEngine:
         # Usando a inércia bruta (estádio I) inicialmente
         
         # Carga quase permanente (serviço)
-        q_elu = sum([l.value for l in span.loads if l.load_type.name == 'DISTRIBUTED'])
+        q_elu = span.q_distributed
         q_serv = q_elu / 1.4 # Desfazer majoração
         
         # Conversão de unidades
@@ -208,10 +207,11 @@ if __name__ == "__main__":
     span.loads.append(Load(LoadType.DISTRIBUTED, 15.0, 0, 6)) # 15 kN/m ELU
     
     # Mock de resultados de Design (necessário para ELS)
-    span.design_results = {
-        "As_inf_vao": 6.5, # cm²
-        "Md_max": 67.5     # kNm
-    }
+    from app.engines.elu_design import DesignResult
+    span.design_results = DesignResult(
+        As_inf_vao=6.5, # cm²
+        Md_max=67.5     # kNm
+    )
     
     beam = Beam(id="Test_ELS")
     beam.spans.append(span)
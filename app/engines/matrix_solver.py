@@ -1,6 +1,24 @@
+import functools
 import numpy as np
 from typing import List, Tuple, Dict
-from app.models.entities import Beam, BeamSpan, Node, LoadType
+from app.models.entities import Beam, BeamSpan, Node
+from app.engines import _kernels as kernels
+
+@functools.lru_cache(maxsize=None)
+def _scipy_linalg():
+    """
+    Importa scipy.linalg sob demanda (~0.2 s de importação, fora da abertura da CLI/GUI).
+    scipy é opcional: retorna None se não estiver instalado (solução densa com np.linalg.solve).
+    """
+    try:
+        import scipy.linalg
+        return scipy.linalg
+    except ImportError:
+        return None
+
+# Semi-largura de banda de K: cada vão acopla só os 4 DOFs de seus dois nós,
+# logo |i - j| <= 3 (também em K_reduced, pois remover DOFs só aproxima os índices)
+BANDWIDTH = 3
 
 class MatrixSolver:
     """
@@ -19,158 +37,168 @@ class MatrixSolver:
         self.n_nodes = len(beam.nodes)
         self.n_dofs = self.n_nodes * 2 
         
-        # Estruturas Globais
-        self.K_global = np.zeros((self.n_dofs, self.n_dofs))
-        self.F_global = np.zeros(self.n_dofs)
+        # Propriedades dos vãos e apoios em layout SoA (beam._span_EI, _span_L, _span_q,
+        # _support_mask): a montagem trabalha só sobre estes arrays, sem acessar os objetos
+        beam.rebuild_soa()
+
+        # Partição dos DOFs (livres x restringidos) antes da montagem:
+        # o sistema reduzido é montado diretamente, sem a matriz global densa
+        self._partition_dofs()
+
+        # Estruturas do Sistema Reduzido (apenas DOFs livres)
+        n_free = self.free_dofs.shape[0]
+        self.K_reduced = np.zeros((n_free, n_free))
+        self.F_reduced = np.zeros(n_free)
         self.displacements = np.zeros(self.n_dofs)
 
+    def _partition_dofs(self):
+        """
+        Classifica os DOFs e monta o mapa global -> reduzido
+        (self._reduced_idx[g] = índice no sistema reduzido, ou -1 se restringido).
+        """
+        # Condições de Apoio: [Restrição Y, Restrição Rotação] por nó -> DOFs [2i, 2i+1].
+        # DOF livre = não restringido (ex: rotação em apoios simples de vigas contínuas)
+        self.free_dofs = np.flatnonzero(~self.beam._support_mask.ravel())
+        self._reduced_idx = np.full(self.n_dofs, -1, dtype=np.int64)
+        self._reduced_idx[self.free_dofs] = np.arange(self.free_dofs.shape[0])
+
     def solve(self):
         if not self.beam.spans:
             raise ValueError("A viga não possui vãos definidos.")
 
-        # 1. Montagem da Matriz de Rigidez Global [K]
-        self._assemble_stiffness_matrix()
-
-        # 2. Montagem do Vetor de Forças [F]
-        self._assemble_load_vector()
+        # 1. Montagem da Matriz de Rigidez [K] e do Vetor de Forças [F] (reduzidos)
+        self._assemble_system()
 
-        # 3. Solução do Sistema
+        # 2. Solução do Sistema
         self._solve_system()
 
-        # 4. Pós-processamento
+        # 3. Pós-processamento
         self._compute_internal_forces()
 
-    def _assemble_stiffness_matrix(self):
-        # Assume nós sequenciais baseados na ordem dos spans
-        current_node_idx = 0
-
-        for span in self.beam.spans:
-            E = span.material.Ecs * 1000  # MPa -> kN/m²
-            I = span.section.inertia * 1e-8 # cm^4 -> m^4
-            L = span.length
-
-            # Matriz Local (4x4)
-            k = (E * I / (L**3)) * np.array([
-                [12,      6*L,     -12,     6*L],
-                [6*L,     4*L**2,  -6*L,    2*L**2],
-                [-12,     -6*L,    12,      -6*L],
-                [6*L,     2*L**2,  -6*L,    4*L**2]
-            ])
-
-            # Mapeamento Global
-            idx_i = current_node_idx
-            idx_j = current_node_idx + 1
-            
-            indices = [2*idx_i, 2*idx_i+1, 2*idx_j, 2*idx_j+1]
-
-            for i in range(4):
-                for j in range(4):
-                    self.K_global[indices[i], indices[j]] += k[i, j]
-
-            current_node_idx += 1
-
-    def _assemble_load_vector(self):
-        current_node_idx = 0
-
-        for span in self.beam.spans:
-            L = span.length
-            f_local = np.zeros(4)
-
-            for load in span.loads:
-                if load.load_type == LoadType.DISTRIBUTED:
-                    q = load.value # kN/m (Positivo para baixo)
-                    
-                    # Reações de Engaste Perfeito (REP)
-                    # V = qL/2, M = qL²/12
-                    r_v1 = q * L / 2
-                    r_m1 = q * (L**2) / 12
-                    r_v2 = q * L / 2
-                    r_m2 = -q * (L**2) / 12 
-
-                    f_local[0] += r_v1
-                    f_local[1] += r_m1
-                    f_local[2] += r_v2
-                    f_local[3] += r_m2
-            
-            # Transferir para Global (F_eq = -REP)
-            # Para carga gravitacional (para baixo), REP vertical é para CIMA (+).
-            # Logo, F_eq vertical é para BAIXO (-).
-            # O solver espera vetor de forças nodais.
-            
-            idx_i = current_node_idx
-            idx_j = current_node_idx + 1
-            indices = [2*idx_i, 2*idx_i+1, 2*idx_j, 2*idx_j+1]
-            
-            # Subtrai as reações (equivale a aplicar carga nodal inversa)
-            for i in range(4):
-                self.F_global[indices[i]] -= f_local[i]
-
-            current_node_idx += 1
+    def _assemble_system(self):
+        """
+        Montagem de [K] e {F} reduzidos em um único kernel compilado
+        (cada termo vai direto para a posição reduzida; DOFs restringidos são descartados).
+        Guarda as matrizes locais (self._k_locals) e as reações de engaste perfeito
+        (self._f_fixed) de cada vão para o pós-processamento.
+        """
+        beam = self.beam
+        n = len(beam.spans)
+        self._k_locals = np.empty((n, 4, 4))
+        self._f_fixed = np.empty((n, 4))
+
+        # Para carga gravitacional (para baixo), REP vertical é para CIMA (+).
+        # Logo, F_eq vertical é para BAIXO (-): o kernel subtrai as reações.
+        kernels.assemble_system(self.K_reduced, self.F_reduced, self._k_locals, self._f_fixed,
+                                beam._span_EI, beam._span_L, beam._span_q, self._reduced_idx)
 
     def _solve_system(self):
-        free_dofs = []
-        
-        for i, node in enumerate(self.beam.nodes):
-            # Condições de Apoio: [Restrição Y, Restrição Rotação]
-            # Se support_conditions[0] é True (Apoio), então Y está preso.
-            # Se False, é livre.
-            
-            # DOF Translação Y (2*i)
-            if not node.support_conditions[0]: 
-                free_dofs.append(2*i)
-            
-            # DOF Rotação Z (2*i + 1)
-            # Geralmente livre em vigas contínuas sobre apoios simples
-            if not node.support_conditions[1]: 
-                free_dofs.append(2*i + 1)
-
-        K_reduced = self.K_global[np.ix_(free_dofs, free_dofs)]
-        F_reduced = self.F_global[free_dofs]
+        K_reduced = self.K_reduced
+        F_reduced = self.F_reduced
 
+        linalg = _scipy_linalg()
         try:
-            u_reduced = np.linalg.solve(K_reduced, F_reduced)
+            if linalg is not None and K_reduced.shape[0] > 0:
+                u_reduced = linalg.solve_banded((BANDWIDTH, BANDWIDTH), self._to_banded(K_reduced), F_reduced)
+            else:
+                u_reduced = np.linalg.solve(K_reduced, F_reduced)
         except np.linalg.LinAlgError:
             raise Exception("Matriz Singular. Verifique se a estrutura é estável (hipostática?).")
 
-        np.put(self.displacements, free_dofs, u_reduced)
+        self.displacements[self.free_dofs] = u_reduced
+
+    @staticmethod
+    def _to_banded(K: np.ndarray) -> np.ndarray:
+        """
+        Empacota a matriz de banda K no formato LAPACK (dgbsv) de solve_banded:
+        ab[u + i - j, j] = K[i, j], com u = l = BANDWIDTH. Custo O(n), em vez de O(n³) da solução densa.
+        """
+        n = K.shape[0]
+        u = BANDWIDTH
+        ab = np.zeros((2 * u + 1, n))
+        for offset in range(-min(u, n - 1), min(u, n - 1) + 1): # offset = j - i
+            diag = np.diagonal(K, offset)
+            if offset >= 0:
+                ab[u - offset, offset:] = diag
+            else:
+                ab[u - offset, :n + offset] = diag
+        return ab
 
     def _compute_internal_forces(self):
-        current_node_idx = 0
-
-        for span in self.beam.spans:
-            E = span.material.Ecs * 1000
-            I = span.section.inertia * 1e-8
-            L = span.length
-
-            k_local = (E * I / (L**3)) * np.array([
-                [12, 6*L, -12, 6*L],
-                [6*L, 4*L**2, -6*L, 2*L**2],
-                [-12, -6*L, 12, -6*L],
-                [6*L, 2*L**2, -6*L, 4*L**2]
-            ])
-
-            idx_i = current_node_idx
-            idx_j = current_node_idx + 1
-            indices = [2*idx_i, 2*idx_i+1, 2*idx_j, 2*idx_j+1]
-            u_elem = self.displacements[indices]
-
-            f_disp = np.dot(k_local, u_elem)
-
-            f_fixed = np.zeros(4)
-            for load in span.loads:
-                if load.load_type == LoadType.DISTRIBUTED:
-                    q = load.value
-                    f_fixed[0] += q * L / 2
-                    f_fixed[1] += q * L**2 / 12
-                    f_fixed[2] += q * L / 2
-                    f_fixed[3] -= q * L**2 / 12
-            
-            f_final = f_disp + f_fixed
+        spans = self.beam.spans
+        forces = np.empty((len(spans), 4))
+        kernels.internal_forces(self._k_locals, self._f_fixed, self.displacements, forces)
+
+        # Espelho SoA dos esforços (consumido pelo ELU)
+        beam = self.beam
+        beam._span_vl = np.ascontiguousarray(forces[:, 0])
+        beam._span_ml = np.ascontiguousarray(forces[:, 1])
+        beam._span_vr = np.ascontiguousarray(forces[:, 2])
+        beam._span_mr = np.ascontiguousarray(forces[:, 3])
+
+        # Mapeamento para Convenção de Resistência (já aplicado no kernel)
+        # tolist(): floats Python de uma vez, sem criar um array por linha
+        for span, (v_left, m_left, v_right, m_right) in zip(spans, forces.tolist()):
+            span.shear_left = v_left
+            span.moment_left = m_left
+            span.shear_right = v_right
+            span.moment_right = m_right
+
+class HeightSweepSolver(MatrixSolver):
+    """
+    Avaliação parcial do MatrixSolver para a varredura de alturas do otimizador.
+    Entre as tentativas só mudam a altura h (igual em todos os vãos) e o peso próprio;
+    L, bw, Ecs e apoios são fixos. Como I = bw·h³/12, K(h) = h³ · K₁, onde K₁ é a
+    rigidez para h = 1 cm: K₁ é montada e fatorada (Cholesky em banda) uma única vez,
+    e cada tentativa só monta {F} e faz a retro-substituição.
+    """
+
+    def __init__(self, beam: Beam):
+        super().__init__(beam)
+
+        # Rigidez unitária (h = 1 cm) a partir da seção atual: EI₁ = EI / h³
+        n = len(beam.spans)
+        self._k_unit = np.empty((n, 4, 4))
+        kernels.assemble_stiffness(self.K_reduced, self._k_unit,
+                                   beam._span_EI / beam._span_h**3, beam._span_L, self._reduced_idx)
 
-            # Mapeamento para Convenção de Resistência
-            span.shear_left = f_final[0]
-            span.moment_left = f_final[1]
-            span.shear_right = -f_final[2]
-            span.moment_right = -f_final[3]
+        linalg = _scipy_linalg()
+        try:
+            if linalg is not None and self.K_reduced.shape[0] > 0:
+                # K é simétrica positiva definida (se estável): só a banda superior
+                self._factor = linalg.cholesky_banded(self._to_banded(self.K_reduced)[:BANDWIDTH + 1])
+            else:
+                self._factor = None
+        except np.linalg.LinAlgError:
+            raise Exception("Matriz Singular. Verifique se a estrutura é estável (hipostática?).")
+
+    def solve_for_height(self, h: float):
+        """
+        Resolve a viga com todas as seções na altura h (cm). As seções e as cargas
+        de peso próprio da viga já devem estar atualizadas para esta altura.
+        """
+        beam = self.beam
+        beam.rebuild_soa() # Peso próprio e seção da tentativa
+        n = len(beam.spans)
+        scale = float(h) ** 3
+
+        self._k_locals = self._k_unit * scale
+        self._f_fixed = np.empty((n, 4))
+        self.F_reduced = np.zeros(self.free_dofs.shape[0])
+        kernels.assemble_loads(self.F_reduced, self._f_fixed, beam._span_L, beam._span_q, self._reduced_idx)
+
+        # K(h) u = F  ->  u = K₁⁻¹ F / h³
+        if self._factor is not None:
+            u_reduced = _scipy_linalg().cho_solve_banded((self._factor, False), self.F_reduced)
+        elif self.F_reduced.shape[0] > 0:
+            try:
+                u_reduced = np.linalg.solve(self.K_reduced, self.F_reduced)
+            except np.linalg.LinAlgError:
+                raise Exception("Matriz Singular. Verifique se a estrutura é estável (hipostática?).")
+        else:
+            u_reduced = self.F_reduced
 
-            current_node_idx += 1
\ No newline at end of file
+        self.displacements = np.zeros(self.n_dofs)
+        self.displacements[self.free_dofs] = u_reduced / scale
+
+        self._compute_internal_forces()
@@ -1,26 +1,223 @@
-import copy
-from typing import Dict, List, Tuple
-from app.models.entities import Beam, CrossSection
-from app.engines.matrix_solver import MatrixSolver
+import logging
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from app.models.entities import Beam, CrossSection, LoadType
+from app.engines.matrix_solver import MatrixSolver, HeightSweepSolver
 from app.engines.elu_design import ELUDesignEngine
 from app.engines.els_checker import ELSCheckerEngine
 from app.engines.bar_selector import BarSelectorEngine
 
+logger = logging.getLogger(__name__)
+
+# Campos de resultado que o ciclo de cálculo grava em cada vão
+_SPAN_RESULT_FIELDS = ("moment_left", "moment_right", "shear_left", "shear_right",
+                       "design_results", "els_results")
+
+def _save_trial_state(beam: Beam) -> Tuple[List, List]:
+    """
+    Guarda tudo o que uma tentativa altera na viga: altura da seção,
+    valor das cargas de peso próprio e resultados gravados pelos motores.
+    Substitui o deepcopy da viga inteira (muito mais caro que estas listas).
+    """
+    spans_state = [(span.section.h, tuple(getattr(span, f) for f in _SPAN_RESULT_FIELDS))
+                   for span in beam.spans]
+    pp_state = [(load, load.value) for span in beam.spans for load in span.loads
+                if load.source == "Peso Próprio"]
+    return spans_state, pp_state
+
+def _restore_trial_state(beam: Beam, state: Tuple[List, List]):
+    spans_state, pp_state = state
+    for load, value in pp_state:
+        load.value = value
+    for span, (h, results) in zip(beam.spans, spans_state):
+        span.section.h = h
+        for f, value in zip(_SPAN_RESULT_FIELDS, results):
+            setattr(span, f, value)
+        span.invalidate_load_cache()
+    # O espelho SoA refletia a altura de teste
+    if beam._span_bw is not None:
+        beam.rebuild_soa()
+
+def _evaluate_height(beam: Beam, sweep_solver: Optional[HeightSweepSolver], pp_loads: List[List],
+                     args: Tuple) -> Dict:
+    """
+    Avalia uma altura de teste (cálculo completo + quantitativos + custo).
+    Erros viram um resultado "Erro Calc" em vez de interromper a busca.
+    sweep_solver: HeightSweepSolver pré-fatorado da viga, ou None para o MatrixSolver completo.
+    pp_loads: cargas de peso próprio de cada vão (as mesmas em todas as tentativas).
+    args = (h_test, bw, pp_por_vao, q_por_vao, vol_concreto, custo_concreto, custo_forma, custo_aco_kg)
+    Peso próprio, carga distribuída total e quantitativos de concreto/forma já vêm
+    calculados em lote por optimize_beam.
+
+    A viga é alterada no lugar durante a tentativa e restaurada ao final.
+    """
+    state = _save_trial_state(beam)
+    try:
+        return _run_trial(beam, sweep_solver, pp_loads, *args)
+    finally:
+        _restore_trial_state(beam, state)
+
+def _run_trial(trial_beam: Beam, sweep_solver: Optional[HeightSweepSolver], pp_loads: List[List],
+               h_test: float, bw: float, pp_values: List[float], q_values: List[float],
+               total_conc_vol: float, cost_conc: float, cost_form: float, cost_steel_kg: float) -> Dict:
+    # 1. Aplicar Nova Geometria e Peso Próprio (pré-calculado: bw * h * 25)
+    for span, loads, new_pp, q in zip(trial_beam.spans, pp_loads, pp_values, q_values):
+        span.section.h = float(h_test)
+        for load in loads:
+            load.value = new_pp
+        # Total distribuído já consolidado (demais cargas + peso próprio)
+        span.set_q_distributed(q)
+
+    # 2. Rodar Ciclo Completo de Cálculo (Silent mode)
+    try:
+        # A. Matriz (rigidez já fatorada na varredura; só cargas e retro-substituição)
+        if sweep_solver is not None:
+            sweep_solver.solve_for_height(h_test)
+        else:
+            MatrixSolver(trial_beam).solve()
+
+        # B. ELU
+        elu = ELUDesignEngine()
+        elu.run_design(trial_beam)
+
+        # C. ELS
+        els = ELSCheckerEngine()
+        els.run_checks(trial_beam)
+
+        # D. Detalhamento (Para pegar peso do aço)
+        selector = BarSelectorEngine()
+        total_steel_kg = 0.0
+
+        valid_design = True
+
+        for span in trial_beam.spans:
+            # Checar se passou no ELS (Fissura e Flecha)
+            if span.els_results.status_crack != "OK" or span.els_results.status_deflection != "OK":
+                valid_design = False
+                break # Pula se falhar no serviço
+
+            res = span.design_results
+
+            # Detalhar
+            det_pos = selector.select_longitudinal(res.As_inf_vao, span.section.bw)
+            det_neg_esq = selector.select_longitudinal(res.As_sup_esq, span.section.bw, is_top=True)
+            det_neg_dir = selector.select_longitudinal(res.As_sup_dir, span.section.bw, is_top=True)
+            det_shear = selector.select_stirrup(res.Asw_s_req, span.section.bw, span.section.h)
+
+            # Calcular Quantitativos deste vão
+            L = span.length
+
+            # Aço Longitudinal (Pos + Negs estimativos)
+            # Peso (kg) = Area (cm2) * 1m * 0.0001 (m2/cm2) * 7850 (kg/m3) * L
+            # Simplificado: Area(cm2) * L(m) * 0.785 kg/cm2.m
+
+            if det_pos.count > 0:
+                total_steel_kg += det_pos.area_provided_cm2 * L * 0.785
+            if det_neg_esq.count > 0:
+                total_steel_kg += det_neg_esq.area_provided_cm2 * (L/4) * 0.785 # Estimação comp. negativo
+            if det_neg_dir.count > 0:
+                total_steel_kg += det_neg_dir.area_provided_cm2 * (L/4) * 0.785
+
+            # Estribos
+            if det_shear.status == "OK":
+                # Comp. estribo = 2*(h-4) + 2*(bw-4) + ganchos
+                len_st = 2*((h_test-4) + (bw-4)) + 15.0 # cm
+                num_st = (L * 100) / det_shear.spacing_cm
+                area_st_unit = 2 * 3.1416 * ((det_shear.diameter_mm/10)/2)**2 # 2 pernas
+                # Peso total estribos
+                vol_st_cm3 = num_st * area_st_unit * len_st # Não, area * len
+                # Melhor: Peso kg = (num * len_m) * (kg/m da bitola)
+                # Vamos usar area total
+                total_steel_kg += (num_st * len_st/100) * (area_st_unit * 0.785) # Aprox
+
+        if not valid_design:
+            return {"h": h_test, "status": "Falha ELS", "cost": 99999}
+
+        # Custo Total
+        cost_steel = total_steel_kg * cost_steel_kg
+
+        total_cost = cost_conc + cost_steel + cost_form
+
+        return {
+            "h": h_test,
+            "status": "OK",
+            "cost": round(total_cost, 2),
+            "steel_kg": round(total_steel_kg, 1),
+            "conc_m3": round(total_conc_vol, 2),
+            "as_pos": span.design_results.As_inf_vao # Referência do último vão
+        }
+
+    except Exception as e:
+        return {"h": h_test, "status": f"Erro Calc: {str(e)}", "cost": 99999}
+
 class OptimizerEngine:
     """
     Motor de Otimização de Seção Transversal.
     Busca a altura (h) que minimiza o custo total da viga.
     """
 
-    def __init__(self):
+    # Poda: encerra uma direção da busca após duas tentativas OK seguidas (nessa direção)
+    # com custo acima de (1 + PRUNE_MARGIN) x melhor custo até o momento
+    PRUNE_MARGIN = 0.10
+
+    def __init__(self, early_exit: bool = True):
+        self.early_exit = early_exit   # False = avalia todas as alturas (busca exaustiva)
+
         # Custos Unitários Estimados (Ref: Tabela SINAPI/Composição)
         self.cost_concrete_m3 = 450.0  # R$/m³
         self.cost_steel_kg = 12.0      # R$/kg
         self.cost_formwork_m2 = 80.0   # R$/m² (Forma)
 
+    def _search(self, test_heights: List[int], args: List[Tuple], h_orig: float, evaluate) -> List[Dict]:
+        """
+        Busca a partir da altura de teste mais próxima de h_orig, expandindo primeiro para
+        cima e depois para baixo. O custo é aproximadamente convexo em h: uma direção
+        é encerrada quando as duas últimas tentativas OK nela custam mais de
+        (1 + PRUNE_MARGIN) x o melhor custo e estão além da melhor altura.
+        evaluate(args_da_altura) -> resultado da tentativa.
+        Retorna os resultados avaliados, ordenados por h.
+        """
+        by_h = dict(zip(test_heights, args))
+        anchor = min(test_heights, key=lambda h: abs(h - h_orig))
+        queues = {
+            +1: [h for h in test_heights if h > anchor],                 # Sentido crescente
+            -1: [h for h in reversed(test_heights) if h < anchor],       # Sentido decrescente
+        }
+        streak = {+1: 0, -1: 0}
+        best_cost, best_h = None, None
+        results = []
+        h = anchor
+
+        while h is not None:
+            res = evaluate(by_h[h])
+            results.append(res)
+            if res["status"] == "OK":
+                if best_cost is None or res["cost"] < best_cost:
+                    best_cost, best_h = res["cost"], h
+                    streak = {+1: 0, -1: 0}
+                else:
+                    direction = +1 if h > best_h else -1
+                    if res["cost"] > best_cost * (1 + self.PRUNE_MARGIN):
+                        streak[direction] += 1
+                    else:
+                        streak[direction] = 0
+
+            if self.early_exit:
+                for direction in (+1, -1):
+                    if streak[direction] >= 2:
+                        queues[direction].clear()
+
+            # Próxima altura: sentido crescente enquanto estiver aberto
+            h = queues[+1].pop(0) if queues[+1] else (queues[-1].pop(0) if queues[-1] else None)
+
+        results.sort(key=lambda r: r["h"])
+        return results
+
     def optimize_beam(self, original_beam: Beam) -> Dict:
         """
         Testa alturas de h_min a h_max e retorna um relatório comparativo.
+        Com early_exit, as alturas claramente mais caras não são avaliadas
+        (all_trials traz apenas as tentativas realizadas).
         """
         # Faixa de busca: de 30cm a 80cm (ou +/- 10cm da original)
         h_orig = original_beam.spans[0].section.h # Assume seção constante
@@ -29,117 +226,45 @@ class OptimizerEngine:
         # Opções para testar (Ex: 30, 40, 50, 60...)
         test_heights = [h for h in range(30, 85, 5)] 
         
-        results = []
-        
-        print(f"\n--- Iniciando Otimização para {original_beam.id} ---")
+        logger.info("\n--- Iniciando Otimização para %s ---", original_beam.id)
         
-        for h_test in test_heights:
-            # 1. Clonar a viga para não estragar a original
-            # Deepcopy é necessário pois Beam tem objetos aninhados (Spans, Nodes, Loads)
-            # Nota: Classes dataclass simples funcionam bem com deepcopy
-            trial_beam = copy.deepcopy(original_beam)
-            
-            # 2. Aplicar Nova Geometria e Recalcular Peso Próprio
-            for span in trial_beam.spans:
-                span.section.h = float(h_test)
-                # Atualizar Carga de Peso Próprio
-                # Procura a carga de peso próprio e atualiza
-                for load in span.loads:
-                    if load.source == "Peso Próprio":
-                        # Recalcula: bw * h * 25
-                        new_pp = (span.section.bw/100) * (span.section.h/100) * 25.0
-                        load.value = new_pp
-            
-            # 3. Rodar Ciclo Completo de Cálculo (Silent mode)
-            try:
-                # A. Matriz
-                solver = MatrixSolver(trial_beam)
-                solver.solve()
-                
-                # B. ELU
-                elu = ELUDesignEngine()
-                elu.run_design(trial_beam)
-                
-                # C. ELS
-                els = ELSCheckerEngine()
-                els.run_checks(trial_beam)
-                
-                # D. Detalhamento (Para pegar peso do aço)
-                selector = BarSelectorEngine()
-                total_steel_kg = 0.0
-                total_conc_vol = 0.0
-                total_form_area = 0.0
-                
-                valid_design = True
-                
-                for span in trial_beam.spans:
-                    # Checar se passou no ELS (Fissura e Flecha)
-                    if span.els_results.status_crack != "OK" or span.els_results.status_deflection != "OK":
-                        valid_design = False
-                        break # Pula se falhar no serviço
-                        
-                    res = span.design_results
-                    
-                    # Detalhar
-                    det_pos = selector.select_longitudinal(res.get("As_inf_vao", 0), span.section.bw)
-                    det_neg_esq = selector.select_longitudinal(res.get("As_sup_esq", 0), span.section.bw, is_top=True)
-                    det_neg_dir = selector.select_longitudinal(res.get("As_sup_dir", 0), span.section.bw, is_top=True)
-                    det_shear = selector.select_stirrup(res.get("Asw_s_req", 0), span.section.bw, span.section.h)
-                    
-                    # Calcular Quantitativos deste vão
-                    L = span.length
-                    
-                    # Aço Longitudinal (Pos + Negs estimativos)
-                    # Peso (kg) = Area (cm2) * 1m * 0.0001 (m2/cm2) * 7850 (kg/m3) * L
-                    # Simplificado: Area(cm2) * L(m) * 0.785 kg/cm2.m
-                    
-                    if det_pos.count > 0:
-                        total_steel_kg += det_pos.area_provided_cm2 * L * 0.785
-                    if det_neg_esq.count > 0:
-                        total_steel_kg += det_neg_esq.area_provided_cm2 * (L/4) * 0.785 # Estimação comp. negativo
-                    if det_neg_dir.count > 0:
-                        total_steel_kg += det_neg_dir.area_provided_cm2 * (L/4) * 0.785
-                        
-                    # Estribos
-                    if det_shear.status == "OK":
-                        # Comp. estribo = 2*(h-4) + 2*(bw-4) + ganchos
-                        len_st = 2*((h_test-4) + (bw-4)) + 15.0 # cm
-                        num_st = (L * 100) / det_shear.spacing_cm
-                        area_st_unit = 2 * 3.1416 * ((det_shear.diameter_mm/10)/2)**2 # 2 pernas
-                        # Peso total estribos
-                        vol_st_cm3 = num_st * area_st_unit * len_st # Não, area * len
-                        # Melhor: Peso kg = (num * len_m) * (kg/m da bitola)
-                        # Vamos usar area total
-                        total_steel_kg += (num_st * len_st/100) * (area_st_unit * 0.785) # Aprox
-
-                    # Concreto
-                    total_conc_vol += (bw/100) * (h_test/100) * L
-                    
-                    # Forma (Laterais + Fundo)
-                    total_form_area += (2*(h_test/100) + (bw/100)) * L
-
-                if not valid_design:
-                    results.append({"h": h_test, "status": "Falha ELS", "cost": 99999})
-                    continue
-
-                # Custo Total
-                cost_conc = total_conc_vol * self.cost_concrete_m3
-                cost_steel = total_steel_kg * self.cost_steel_kg
-                cost_form = total_form_area * self.cost_formwork_m2
-                
-                total_cost = cost_conc + cost_steel + cost_form
-                
-                results.append({
-                    "h": h_test,
-                    "status": "OK",
-                    "cost": round(total_cost, 2),
-                    "steel_kg": round(total_steel_kg, 1),
-                    "conc_m3": round(total_conc_vol, 2),
-                    "as_pos": span.design_results.get("As_inf_vao", 0) # Referência do último vão
-                })
-                
-            except Exception as e:
-                results.append({"h": h_test, "status": f"Erro Calc: {str(e)}", "cost": 99999})
+        # Quantitativos que dependem só da geometria, para todas as alturas de uma vez
+        # Grade (n_alturas, n_vãos); apenas o aço depende do cálculo de cada tentativa
+        H = np.array(test_heights, dtype=np.float64)[:, None] / 100 # m
+        L = np.array([s.length for s in original_beam.spans], dtype=np.float64)[None, :]
+        bw_spans = np.array([s.section.bw for s in original_beam.spans], dtype=np.float64)[None, :]
+
+        conc_vol = ((bw/100) * H * L).sum(axis=1)            # Concreto (m³)
+        form_area = ((2*H + (bw/100)) * L).sum(axis=1)       # Forma: Laterais + Fundo (m²)
+        pp_load = (bw_spans/100) * H * 25.0                   # Peso próprio por vão (kN/m)
+
+        # Cargas consolidadas por vão, uma única vez: referências às cargas de peso
+        # próprio e soma das demais distribuídas (constantes entre as tentativas)
+        spans = original_beam.spans
+        pp_refs = [[ld for ld in s.loads if ld.source == "Peso Próprio"] for s in spans]
+        q_other = np.array([sum(ld.value for ld in s.loads
+                                if ld.load_type is LoadType.DISTRIBUTED and ld.source != "Peso Próprio")
+                            for s in spans], dtype=np.float64)[None, :]
+        n_pp = np.array([sum(1 for ld in refs if ld.load_type is LoadType.DISTRIBUTED) for refs in pp_refs],
+                        dtype=np.float64)[None, :]
+        q_trial = q_other + n_pp * pp_load                    # Total distribuído por vão (kN/m)
+        cost_conc = conc_vol * self.cost_concrete_m3
+        cost_form = form_area * self.cost_formwork_m2
+
+        # Avaliação parcial do solver: K(h) = h³·K₁ com K₁ fatorada uma vez para a viga toda.
+        # Válida se Ecs e bw forem os mesmos em todas as tentativas (só h muda).
+        # Se a estrutura for instável, cada tentativa reporta o erro pelo MatrixSolver.
+        try:
+            sweep_solver = HeightSweepSolver(original_beam)
+        except Exception:
+            sweep_solver = None
+
+        args = [(h, bw, pp_load[k].tolist(), q_trial[k].tolist(), float(conc_vol[k]),
+                 float(cost_conc[k]), float(cost_form[k]), self.cost_steel_kg)
+                for k, h in enumerate(test_heights)]
+
+        results = self._search(test_heights, args, h_orig,
+                               lambda a: _evaluate_height(original_beam, sweep_solver, pp_refs, a))
 
         # Selecionar Melhor
         valid_results = [r for r in results if r["status"] == "OK"]
@@ -1,7 +1,12 @@
 from dataclasses import dataclass, field
-from typing import List, Optional, Literal
+from typing import List, Optional, Literal, TYPE_CHECKING
 from enum import Enum
+from functools import cached_property
 import math
+import numpy as np
+
+if TYPE_CHECKING:
+    from app.engines.elu_design import DesignResult
 
 # --- ENUMS E VALUE OBJECTS ---
 
@@ -28,9 +33,42 @@ class Material:
     fyk: float = 500.0 # MPa
     Ecs: float = 23800.0 # MPa
 
-    def get_fcd(self):
+    # Propriedades derivadas de fck e Ecs, calculadas uma vez por instância.
+    # (fck e Ecs não devem ser alterados após o início do cálculo)
+
+    @cached_property
+    def fcd(self) -> float:
         return (self.fck / 1.4) / 10.0 # kN/cm²
 
+    @cached_property
+    def fck_23(self) -> float:
+        return self.fck ** (2/3) # MPa^(2/3)
+
+    @cached_property
+    def fctm(self) -> float:
+        return 0.3 * self.fck_23 / 10.0 # kN/cm²
+
+    def fctd_over(self, gamma_c: float = 1.4) -> float:
+        return (0.21 * self.fck_23) / gamma_c / 10.0 # kN/cm²
+
+    @cached_property
+    def Ecs_kNm2(self) -> float:
+        return self.Ecs * 1000 # MPa -> kN/m²
+
+    def get_fcd(self):
+        return self.fcd
+
+_SECTION_DIMENSIONS = frozenset(("bw", "h", "bf", "hf"))
+
+# Geração das alterações que o espelho SoA de Beam precisa refletir (seções e cargas).
+# Seções e vãos não conhecem a viga dona: os hooks de invalidação incrementam este
+# contador global, e cada Beam guarda a geração em que o seu espelho foi montado.
+_soa_generation = 0
+
+def _mark_soa_dirty():
+    global _soa_generation
+    _soa_generation += 1
+
 @dataclass
 class CrossSection:
     bw: float 
@@ -38,19 +76,31 @@ class CrossSection:
     bf: float = 0.0 
     hf: float = 0.0
 
-    @property
+    # area/inertia são cacheadas e invalidadas automaticamente
+    # quando qualquer dimensão da seção é alterada (ex: otimizador alterando h)
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in _SECTION_DIMENSIONS:
+            self.__dict__.pop("area", None)
+            self.__dict__.pop("inertia", None)
+            _mark_soa_dirty()
+
+    @cached_property
     def area(self) -> float:
         area_web = self.bw * self.h
         area_flange = (self.bf - self.bw) * self.hf if self.bf > self.bw else 0
         return area_web + area_flange
 
-    @property
+    @cached_property
     def inertia(self) -> float:
         return (self.bw * (self.h ** 3)) / 12
 
+# Load, Node e Beam são slotted (sem __dict__ por instância).
+# Material, CrossSection e BeamSpan mantêm __dict__: usam cached_property.
+
 # --- CARGAS ---
 
-@dataclass
+@dataclass(slots=True)
 class Load:
     load_type: LoadType
     value: float
@@ -60,7 +110,7 @@ class Load:
 
 # --- ELEMENTOS ESTRUTURAIS ---
 
-@dataclass
+@dataclass(slots=True)
 class Node:
     id: int
     x: float
@@ -88,16 +138,88 @@ class BeamSpan:
     shear_right: float = 0.0
     
     # Detalhamento
-    design_results: dict = field(default_factory=dict)
+    design_results: Optional["DesignResult"] = None # Preenchido pelo ELU
     detailing_results: dict = field(default_factory=dict)
     els_results: object = None
 
-@dataclass
+    @cached_property
+    def q_distributed(self) -> float:
+        """
+        Soma das cargas distribuídas do vão (kN/m).
+        Cacheado: após alterar `loads` (ou o valor de uma carga), chamar invalidate_load_cache().
+        """
+        return sum(l.value for l in self.loads if l.load_type is LoadType.DISTRIBUTED)
+
+    def invalidate_load_cache(self):
+        self.__dict__.pop("q_distributed", None)
+        _mark_soa_dirty()
+
+    def set_q_distributed(self, q: float):
+        """
+        Define o total distribuído já consolidado pelo chamador (sem re-somar `loads`).
+        O valor deve ser coerente com as cargas atuais do vão.
+        """
+        self.__dict__["q_distributed"] = q
+        _mark_soa_dirty()
+
+@dataclass(slots=True)
 class Beam:
     id: str
     spans: List[BeamSpan] = field(default_factory=list)
     nodes: List[Node] = field(default_factory=list)
     direction_vector: tuple = (1.0, 0.0) 
+
+    # Espelho SoA dos vãos (um array float64 por campo, um elemento por vão).
+    # Populado por rebuild_soa() e consumido pelos motores vetorizados/compilados.
+    _span_bw: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _span_h: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _span_fck: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _span_fcd: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _span_fyk: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _span_ml: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _span_mr: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _span_vl: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _span_vr: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _span_L: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _span_q: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _span_EI: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False) # kNm²
+    # Condições de apoio por nó, shape (n_nodes, 2): [Restrição Y, Restrição Rotação Z]
+    _support_mask: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _soa_gen: int = field(default=-1, init=False, repr=False, compare=False) # Geração do espelho atual
+
+    def rebuild_soa(self):
+        """
+        Reconstrói o espelho SoA a partir dos vãos.
+        Chamado pelo MatrixSolver antes da montagem (que já devolve os esforços
+        direto nos arrays _span_ml/_span_mr/_span_vl/_span_vr); fora dele, chamar
+        após qualquer alteração de seção, material, cargas, apoios ou esforços.
+        """
+        spans = self.spans
+        self._soa_gen = _soa_generation
+        self._span_bw = np.array([s.section.bw for s in spans], dtype=np.float64)
+        self._span_h = np.array([s.section.h for s in spans], dtype=np.float64)
+        self._span_fck = np.array([s.material.fck for s in spans], dtype=np.float64)
+        self._span_fcd = np.array([s.material.fcd for s in spans], dtype=np.float64)
+        self._span_fyk = np.array([s.material.fyk for s in spans], dtype=np.float64)
+        self._span_ml = np.array([s.moment_left for s in spans], dtype=np.float64)
+        self._span_mr = np.array([s.moment_right for s in spans], dtype=np.float64)
+        self._span_vl = np.array([s.shear_left for s in spans], dtype=np.float64)
+        self._span_vr = np.array([s.shear_right for s in spans], dtype=np.float64)
+        self._span_L = np.array([s.length for s in spans], dtype=np.float64)
+        self._span_q = np.array([s.q_distributed for s in spans], dtype=np.float64)
+        # Rigidez à flexão: Ecs (kN/m²) * I (cm^4 -> m^4)
+        self._span_EI = np.array([s.material.Ecs_kNm2 * (s.section.inertia * 1e-8) for s in spans], dtype=np.float64)
+        self._support_mask = np.array([n.support_conditions for n in self.nodes], dtype=bool).reshape(-1, 2)
+
+    def ensure_soa(self):
+        """
+        Reconstrói o espelho SoA se ainda não existir, se o número de vãos mudou ou se
+        alguma seção/carga foi alterada depois da última montagem (CrossSection.__setattr__,
+        invalidate_load_cache, set_q_distributed).
+        """
+        if (self._span_bw is None or self._soa_gen != _soa_generation
+                or self._span_bw.shape[0] != len(self.spans)):
+            self.rebuild_soa()
     
     def add_span(self, length: float, section: CrossSection, mat: Material, 
                  start_coord: tuple = (0.0, 0.0), direction: tuple = (1.0, 0.0),
@@ -1,9 +1,21 @@
-import json
 import os
-import math
+import mmap
+import logging
+import numpy as np
 from typing import Dict
 from app.models.entities import Beam, BeamSpan, Load, LoadType, CrossSection, Material, MaterialType
 
+try:
+    import orjson # Parser opcional (muito mais rápido para arquivos grandes do PyLaje)
+    _loads = orjson.loads
+    _PARSES_BUFFER = True  # orjson lê direto de um memoryview (sem cópia do arquivo)
+except ImportError:
+    import json
+    _loads = json.loads
+    _PARSES_BUFFER = False
+
+logger = logging.getLogger(__name__)
+
 class PyLajeImporter:
     """
     Responsável por traduzir o JSON do ecossistema (PyLaje) 
@@ -17,13 +29,39 @@ class PyLajeImporter:
         if not os.path.exists(self.file_path):
             raise FileNotFoundError(f"Arquivo de integração não encontrado: {self.file_path}")
 
-        with open(self.file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = self._read_json()
 
         beams_dict = {}
         default_concrete = Material(name="C25", type=MaterialType.CONCRETE, fck=25)
 
-        for beam_id, beam_data in data.items():
+        # 1ª passada: geometria de todas as vigas em lote (comprimentos e direções)
+        items = list(data.items())
+        xy = np.array([(bd["coordenadas_globais"]["inicio"]["x"], bd["coordenadas_globais"]["inicio"]["y"],
+                        bd["coordenadas_globais"]["fim"]["x"], bd["coordenadas_globais"]["fim"]["y"])
+                       for _, bd in items], dtype=np.float64).reshape(-1, 4)
+        nominal_raw = [bd["coordenadas_globais"].get("comprimento_total") for _, bd in items]
+        nominal = np.array([np.nan if v is None else v for v in nominal_raw], dtype=np.float64)
+
+        dx_raw = xy[:, 2] - xy[:, 0]
+        dy_raw = xy[:, 3] - xy[:, 1]
+        # Recalcular comprimento real baseado nas coordenadas (mais seguro que confiar no campo 'comprimento_total')
+        calc_lengths = np.hypot(dx_raw, dy_raw)
+        nominal = np.where(np.isnan(nominal), calc_lengths, nominal)
+
+        # Se houver discrepância grande, use o calculado
+        mismatch = np.abs(calc_lengths - nominal) > 0.1
+        lengths = np.where(mismatch, calc_lengths, nominal)
+
+        # Calcular vetor direção unitário (dx, dy); Default Horizontal se comprimento nulo
+        valid = lengths > 0.001
+        safe_len = np.where(valid, lengths, 1.0)
+        dirs_x = np.where(valid, dx_raw / safe_len, 1.0)
+        dirs_y = np.where(valid, dy_raw / safe_len, 0.0)
+
+        # 2ª passada: construção dos objetos
+        geometry = zip(xy.tolist(), nominal_raw, calc_lengths.tolist(), mismatch.tolist(),
+                       lengths.tolist(), dirs_x.tolist(), dirs_y.tolist())
+        for (beam_id, beam_data), ((x_start, y_start, _, _), nominal_len, calc_length, differs, length, dx, dy) in zip(items, geometry):
             new_beam = Beam(id=beam_id)
             
             # Geometria
@@ -31,28 +69,9 @@ class PyLajeImporter:
             bw, h = map(float, geo_str.lower().split('x'))
             current_section = CrossSection(bw=bw, h=h)
 
-            # Coordenadas e Direção
-            coords = beam_data["coordenadas_globais"]
-            x_start = coords["inicio"]["x"]
-            y_start = coords["inicio"]["y"]
-            x_end = coords["fim"]["x"]
-            y_end = coords["fim"]["y"]
-            
-            # Recalcular comprimento real baseado nas coordenadas (mais seguro que confiar no campo 'comprimento_total')
-            calc_length = math.sqrt((x_end - x_start)**2 + (y_end - y_start)**2)
-            length = coords.get("comprimento_total", calc_length)
-            
-            # Se houver discrepância grande, use o calculado
-            if abs(calc_length - length) > 0.1:
-                print(f"⚠️  Aviso: Comprimento nominal ({length}) difere do calculado ({calc_length:.2f}) para viga {beam_id}. Usando calculado.")
-                length = calc_length
-
-            # Calcular vetor direção unitário (dx, dy)
-            if length > 0.001:
-                dx = (x_end - x_start) / length
-                dy = (y_end - y_start) / length
-            else:
-                dx, dy = 1.0, 0.0 # Default Horizontal
+            if differs:
+                logger.warning("⚠️  Aviso: Comprimento nominal (%s) difere do calculado (%.2f) para viga %s. Usando calculado.",
+                               nominal_len, calc_length, beam_id)
 
             # Adicionar Vão passando coordenadas globais reais
             span = new_beam.add_span(
@@ -99,4 +118,17 @@ class PyLajeImporter:
 
             beams_dict[beam_id] = new_beam
 
-        return beams_dict
\ No newline at end of file
+        return beams_dict
+
+    def _read_json(self):
+        """
+        Lê e faz o parse do arquivo uma única vez.
+        Com orjson, o arquivo é mapeado em memória e passado ao parser sem cópia
+        intermediária para bytes; sem ele, leitura em bytes (json aceita UTF-8).
+        """
+        with open(self.file_path, 'rb') as f:
+            if _PARSES_BUFFER and os.fstat(f.fileno()).st_size > 0:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as view:
+                        return _loads(view)
+            return _loads(f.read())
\ No newline at end of file
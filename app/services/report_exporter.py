@@ -1,8 +1,16 @@
 import json
 import os
+import logging
 from typing import Dict, List, Set, Any
 from app.models.entities import Beam
 
+try:
+    import orjson # Serializador opcional (mais rápido que o json da stdlib)
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
 class DataExporter:
     """
     Exportador avançado com suporte a Momentos de Engaste e separação de lógica.
@@ -16,7 +24,7 @@ class DataExporter:
         Processa as vigas e retorna a lista de dados dos pilares (sem salvar arquivo).
         Útil para preencher a GUI antes de exportar.
         """
-        # Chave: "x,y" | Valor: dict acumulador
+        # Chave: (x, y) | Valor: dict acumulador
         column_map = {}
 
         for beam_id, beam in beams.items():
@@ -50,11 +58,11 @@ class DataExporter:
         output_list = []
         
         # Ordenação geométrica (Y asc, X asc)
-        sorted_coords = sorted(column_map.keys(), key=lambda k: (float(k.split(',')[1]), float(k.split(',')[0])))
+        sorted_coords = sorted(column_map.keys(), key=lambda k: (k[1], k[0]))
 
         for idx, coord_key in enumerate(sorted_coords):
             data = column_map[coord_key]
-            x, y = map(float, coord_key.split(','))
+            x, y = coord_key
             
             output_list.append({
                 "id_estimado": f"P{idx + 1}", # ID sugerido (pode ser editado na GUI)
@@ -73,14 +81,21 @@ class DataExporter:
         """Salva a lista de dados processados (possivelmente editada) no JSON."""
         path = filepath if filepath else self.output_path
         try:
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(data_list, f, indent=4)
+            # Mesmo formato nos dois caminhos: indentação de 2 espaços, UTF-8 sem escapes \uXXXX
+            if orjson is not None:
+                # Esforços podem vir como numpy.float64 (saída do solver)
+                with open(path, 'wb') as f:
+                    f.write(orjson.dumps(data_list, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+            else:
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(data_list, f, indent=2, ensure_ascii=False)
             return True, f"Salvo em: {path}"
         except Exception as e:
             return False, str(e)
 
     def _accumulate(self, agg_dict, node, beam_id, fz, moment, dx, dy):
-        key = f"{round(node.x, 3)},{round(node.y, 3)}"
+        # Tupla de floats: hashável, sem formatação/parsing de string
+        key = (float(round(node.x, 3)), float(round(node.y, 3)))
         
         if key not in agg_dict:
             agg_dict[key] = {"Fz": 0.0, "Mx": 0.0, "My": 0.0, "vigas": set()}
@@ -98,4 +113,7 @@ class DataExporter:
     def export_pillar_loads(self, beams: Dict[str, Beam]):
         data = self.calculate_reactions(beams)
         success, msg = self.save_json(data)
-        print(msg if success else f"Erro: {msg}")
\ No newline at end of file
+        if success:
+            logger.info(msg)
+        else:
+            logger.error(f"Erro: {msg}")
\ No newline at end of file
@@ -1,5 +1,6 @@
 import os
 import sys
+import logging
 
 # Correção de Path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -8,163 +9,277 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from app.controllers.beam_controller import BeamController
-from app.ui.plots import BeamPlotter
-from app.services.report_exporter import DataExporter
+# BeamPlotter (matplotlib) e DataExporter são importados só no menu que os usa
+
+# Separadores do relatório (montados uma vez)
+_SEP70 = '-' * 70
+_SEP80 = '=' * 80
+_SEP70_INDENT = f"   {_SEP70}"
+_HEADER = f"{'RELATÓRIO DE DETALHAMENTO DE VIGAS':^80}"
+
+# Menu principal (montado uma vez)
+_SEP50 = '=' * 50
+_MENU_BANNER = (
+    f"{_SEP50}\n"
+    "    PyViga - Dimensionamento e Detalhamento       \n"
+    f"{_SEP50}\n"
+    "1. Processar arquivo de Lajes (JSON)\n"
+    "2. Visualizar Gráficos (DEC/DMF)\n"
+    "3. Exportar Cargas para Pilares (JSON)\n"
+    "4. Otimizar Seção da Viga\n"
+    "5. Modo Demo\n"
+    "6. Ver Último Relatório\n"
+    "0. Sair\n"
+    f"{_SEP50}\n"
+)
+_NO_BEAMS = "Status: Nenhuma viga carregada.\n"
+_SEP50_LINE = f"{_SEP50}\n"
+
+def _ask(prompt):
+    """
+    Equivalente a input() lendo direto de sys.stdin (sem a configuração do readline a cada chamada).
+    Retorna a linha sem a quebra final; EOFError no fim da entrada, como input().
+    """
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip("\r\n")
+
+# Arquivo do Modo Demo (conteúdo fixo, serializado uma vez na importação)
+_DEMO_DATA = {
+    "V_Demo": {
+        "id": "V_Demo",
+        "geometria_estimada": "20x50",
+        "coordenadas_globais": {
+            "inicio": { "x": 0.0, "y": 0.0 },
+            "fim": { "x": 6.0, "y": 0.0 },
+            "comprimento_total": 6.0
+        },
+        "cargas_distribuidas": [
+            {
+                "origem": "Exemplo",
+                "tipo": "Reacao Vertical",
+                "valor_kNm": 15.0,
+                "posicao_na_viga": { "inicio": 0.0, "fim": 6.0, "comprimento": 6.0 }
+            }
+        ]
+    }
+}
+try:
+    import orjson
+    _DEMO_BYTES = orjson.dumps(_DEMO_DATA)
+except ImportError:
+    import json
+    _DEMO_BYTES = json.dumps(_DEMO_DATA).encode("utf-8")
+
+# Símbolos de status (qualquer valor diferente de "OK" é reprovado)
+_OK_GLYPHS = {"OK": "✅"}
+
+def _glyph(status):
+    return _OK_GLYPHS.get(status, "❌")
+
+# Limpa a tela e posiciona o cursor no topo (sequência ANSI/VT100)
+_ANSI_CLEAR = "\x1b[2J\x1b[H"
+
+def _detect_clear_sequence():
+    """
+    Retorna a sequência ANSI de limpeza se o terminal a suportar, ou None
+    (fallback para os.system). No Windows 10+ habilita o modo VT do console.
+    """
+    if not sys.stdout.isatty():
+        return None
+    if os.name == 'nt':
+        try:
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            handle = kernel32.GetStdHandle(-11) # STD_OUTPUT_HANDLE
+            mode = ctypes.c_uint32()
+            if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+                return None
+            # ENABLE_VIRTUAL_TERMINAL_PROCESSING = 0x0004
+            if not kernel32.SetConsoleMode(handle, mode.value | 0x0004):
+                return None
+        except (AttributeError, OSError):
+            return None
+    return _ANSI_CLEAR
 
 class CommandLineInterface:
     def __init__(self):
         self.controller = BeamController()
         self.current_beams = {} 
+        self._clear_seq = _detect_clear_sequence()
+        # Relatório formatado por versão de current_beams (incrementada a cada alteração)
+        self._report_cache: dict[int, str] = {}
+        self._beams_version = 0
+        # Opção do menu -> (handler, exige vigas carregadas)
+        self._dispatch = {
+            "1": (self._menu_process_file, False),
+            "2": (self._menu_plots_current, True),
+            "3": (self._menu_export, True),
+            "4": (self._menu_optimize, True),
+            "5": (self._menu_demo, False),
+            "6": (self._menu_last_report, True),
+            "0": (sys.exit, False),
+        }
 
     def run(self):
+        write = sys.stdout.write
         while True:
             self._clear_screen()
-            print("==================================================")
-            print("    PyViga - Dimensionamento e Detalhamento       ")
-            print("==================================================")
-            print("1. Processar arquivo de Lajes (JSON)")
-            print("2. Visualizar Gráficos (DEC/DMF)")
-            print("3. Exportar Cargas para Pilares (JSON)")
-            print("4. Otimizar Seção da Viga")
-            print("5. Modo Demo")
-            print("0. Sair")
-            print("==================================================")
-            
-            if self.current_beams:
-                print(f"Status: {len(self.current_beams)} vigas carregadas.")
-            else:
-                print("Status: Nenhuma viga carregada.")
-            print("==================================================")
+            write(_MENU_BANNER)
+            write(f"Status: {len(self.current_beams)} vigas carregadas.\n" if self.current_beams else _NO_BEAMS)
+            write(_SEP50_LINE)
 
-            choice = input("Opção: ")
+            choice = _ask("Opção: ").strip()
             
-            if choice == "1":
-                self._menu_process_file()
-            elif choice == "2":
-                if self.current_beams: self._menu_plots(self.current_beams)
-            elif choice == "3":
-                if self.current_beams: self._menu_export()
-            elif choice == "4":
-                if self.current_beams: self._menu_optimize()
-            elif choice == "5":
-                self._menu_demo()
-            elif choice == "0":
-                sys.exit()
+            entry = self._dispatch.get(choice)
+            if entry is None:
+                continue
+            handler, needs_beams = entry
+            if needs_beams and not self.current_beams:
+                continue
+            handler()
 
     def _menu_process_file(self):
-        path = input("\nArquivo JSON (ex: vigas.json): ")
+        path = _ask("\nArquivo JSON (ex: vigas.json): ")
         if not os.path.exists(path):
             print("Arquivo não encontrado!")
-            input("Enter...")
+            _ask("Enter...")
             return
 
         print("\nProcessando...")
         self.current_beams = self.controller.run_batch_analysis(path)
+        self._invalidate_report()
         self._print_detailed_report(self.current_beams)
-        input("\nPressione Enter para voltar...")
+        _ask("\nPressione Enter para voltar...")
+
+    def _menu_last_report(self):
+        # Reexibe o relatório das vigas carregadas (sem reimportar; reaproveita o cache)
+        self._print_detailed_report(self.current_beams)
+        _ask("\nPressione Enter para voltar...")
+
+    def _invalidate_report(self):
+        self._beams_version += 1
+        self._report_cache.clear()
 
     def _print_detailed_report(self, beams):
-        print("\n" + "="*80)
-        print(f"{'RELATÓRIO DE DETALHAMENTO DE VIGAS':^80}")
-        print("="*80)
+        # Só o relatório de current_beams é reaproveitado (outros dicts são sempre formatados)
+        cacheable = beams is self.current_beams
+        text = self._report_cache.get(self._beams_version) if cacheable else None
+        if text is None:
+            text = self._format_detailed_report(beams)
+            if cacheable:
+                self._report_cache[self._beams_version] = text
+
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    def _format_detailed_report(self, beams):
+        # Relatório montado em memória e emitido com uma única escrita no stdout
+        parts: list[str] = []
+        append = parts.append
+
+        append("\n" + _SEP80)
+        append(_HEADER)
+        append(_SEP80)
         
         for b_id, beam in beams.items():
-            print(f"\n>> VIGA: {beam.id} (Vãos: {len(beam.spans)})")
+            append(f"\n>> VIGA: {beam.id} (Vãos: {len(beam.spans)})")
             
             for i, span in enumerate(beam.spans):
-                print(f"   Vão {i+1}: {span.length:.2f}m | Seção {span.section.bw}x{span.section.h} cm")
-                print(f"   {'-'*70}")
-                
-                # VERIFICAÇÃO TÉCNICA
-                res = getattr(span, 'design_results', {})
+                section = span.section
                 els = getattr(span, 'els_results', None)
+                det = getattr(span, 'detailing_results', None)
+
+                append(f"   Vão {i+1}: {span.length:.2f}m | Seção {section.bw}x{section.h} cm")
+                append(_SEP70_INDENT)
                 
+                # VERIFICAÇÃO TÉCNICA
                 if els:
-                    status_wk = "✅" if els.status_crack == "OK" else "❌"
-                    status_def = "✅" if els.status_deflection == "OK" else "❌"
-                    print(f"   [ESTADO LIMITE DE SERVIÇO]")
-                    print(f"     Fissuração: {status_wk} {els.wk_calc:.2f}mm (Lim: {els.wk_limit}mm)")
-                    print(f"     Flecha:     {status_def} {els.deflection_total:.2f}mm (Lim: {els.deflection_limit:.2f}mm)")
+                    append("   [ESTADO LIMITE DE SERVIÇO]")
+                    append(f"     Fissuração: {_glyph(els.status_crack)} {els.wk_calc:.2f}mm (Lim: {els.wk_limit}mm)")
+                    append(f"     Flecha:     {_glyph(els.status_deflection)} {els.deflection_total:.2f}mm (Lim: {els.deflection_limit:.2f}mm)")
                 
-                print(f"   [DETALHAMENTO DA ARMADURA]")
-                det = getattr(span, 'detailing_results', None)
+                append("   [DETALHAMENTO DA ARMADURA]")
                 
                 if det:
                     est = det['stirrups']
-                    print(f"     ESTRIBOS:   Ø{est.diameter_mm:.1f} c/{est.spacing_cm} cm ({est.status})")
+                    append(f"     ESTRIBOS:   Ø{est.diameter_mm:.1f} c/{est.spacing_cm} cm ({est.status})")
                     
                     pos = det['positive']
-                    print(f"     POSITIVA:   {pos.count} Ø{pos.diameter_mm:.1f} mm (As: {pos.area_provided_cm2:.2f} cm²)")
-                    if pos.count > 0:
-                        print(f"                 Ancoragem reta necessária: {pos.anchorage_length_cm} cm")
+                    pos_count = pos.count
+                    append(f"     POSITIVA:   {pos_count} Ø{pos.diameter_mm:.1f} mm (As: {pos.area_provided_cm2:.2f} cm²)")
+                    if pos_count > 0:
+                        append(f"                 Ancoragem reta necessária: {pos.anchorage_length_cm} cm")
 
                     neg_esq = det['negative_left']
                     if neg_esq.count > 0:
-                        print(f"     NEG. ESQ:   {neg_esq.count} Ø{neg_esq.diameter_mm:.1f} mm (Lb: {neg_esq.anchorage_length_cm} cm)")
+                        append(f"     NEG. ESQ:   {neg_esq.count} Ø{neg_esq.diameter_mm:.1f} mm (Lb: {neg_esq.anchorage_length_cm} cm)")
                     else:
-                        print(f"     NEG. ESQ:   Mínima/Construtiva")
+                        append("     NEG. ESQ:   Mínima/Construtiva")
 
                     neg_dir = det['negative_right']
                     if neg_dir.count > 0:
-                        print(f"     NEG. DIR:   {neg_dir.count} Ø{neg_dir.diameter_mm:.1f} mm (Lb: {neg_dir.anchorage_length_cm} cm)")
+                        append(f"     NEG. DIR:   {neg_dir.count} Ø{neg_dir.diameter_mm:.1f} mm (Lb: {neg_dir.anchorage_length_cm} cm)")
                     
                     skin = det.get('skin')
                     if skin and "Não necessário" not in skin.status:
-                         print(f"     PELE:       {skin.status} Ø{skin.diameter_mm:.1f} mm")
+                         append(f"     PELE:       {skin.status} Ø{skin.diameter_mm:.1f} mm")
                 else:
-                    print("     [!] Detalhamento não disponível.")
+                    append("     [!] Detalhamento não disponível.")
                 
-                print(f"   {'-'*70}")
+                append(_SEP70_INDENT)
+
+        append("")
+        return "\n".join(parts)
 
     def _menu_plots(self, beams):
+        from app.ui.plots import BeamPlotter
         while True:
-            beam_id = input("\nID da viga para gráfico (ou 'v' voltar): ")
+            beam_id = _ask("\nID da viga para gráfico (ou 'v' voltar): ")
             if beam_id.lower() == 'v': break
             if beam_id in beams:
                 BeamPlotter.plot_results(beams[beam_id])
             else:
                 print("ID inválido.")
 
+    def _menu_plots_current(self):
+        self._menu_plots(self.current_beams)
+
     def _menu_export(self):
+        from app.services.report_exporter import DataExporter
         exporter = DataExporter()
         exporter.export_pillar_loads(self.current_beams)
-        input("Enter...")
+        _ask("Enter...")
 
     def _menu_optimize(self):
         print("\n--- Otimização de Seção ---")
-        beam_id = input("Digite o ID da viga para otimizar: ")
+        beam_id = _ask("Digite o ID da viga para otimizar: ")
         if beam_id in self.current_beams:
             self.controller.run_optimization(beam_id, self.current_beams)
+            self._invalidate_report()
         else:
             print("Viga não encontrada.")
-        input("\nPressione Enter para continuar...")
+        _ask("\nPressione Enter para continuar...")
 
     def _menu_demo(self):
-        import json
         filename = "demo_vigas.json"
-        data = {
-            "V_Demo": {
-                "id": "V_Demo",
-                "geometria_estimada": "20x50",
-                "coordenadas_globais": { "comprimento_total": 6.0 },
-                "cargas_distribuidas": [
-                    {
-                        "origem": "Exemplo",
-                        "tipo": "Reacao Vertical",
-                        "valor_kNm": 15.0,
-                        "posicao_na_viga": { "inicio": 0.0, "fim": 6.0, "comprimento": 6.0 }
-                    }
-                ]
-            }
-        }
-        with open(filename, "w") as f:
-            json.dump(data, f)
+        with open(filename, "wb") as f:
+            f.write(_DEMO_BYTES)
         print(f"Arquivo '{filename}' criado com sucesso!")
-        input("Pressione Enter para continuar...")
+        _ask("Pressione Enter para continuar...")
 
     def _clear_screen(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
+        if self._clear_seq:
+            sys.stdout.write(self._clear_seq)
+            sys.stdout.flush()
+        else:
+            os.system('cls' if os.name == 'nt' else 'clear')
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(message)s", stream=sys.stdout)
+    logging.getLogger("app").setLevel(logging.INFO)
     cli = CommandLineInterface()
     cli.run()
\ No newline at end of file
@@ -1,64 +1,207 @@
 import sys
 import os
+from contextlib import contextmanager
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QTabWidget, QPushButton, QLabel, QFileDialog, 
-                             QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox,
+                             QTableView, QHeaderView, QMessageBox,
                              QListWidget, QGroupBox, QSpinBox, QSplitter, QCheckBox, QTextEdit)
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QAction, QColor, QFont
+from PyQt6.QtCore import Qt, QTimer, QThread
+from PyQt6.QtGui import QAction, QFont
 
 # Integração Matplotlib
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
+from matplotlib.collections import LineCollection
+from matplotlib.ticker import MaxNLocator
 import matplotlib.pyplot as plt
 import numpy as np
 
 from app.controllers.beam_controller import BeamController
-from app.models.entities import LoadType
+from app.ui.plots import BeamPlotter
+from app.engines._jit import prefer_threadsafe_layer
+from app.ui.gui.table_models import BeamTableModel, DetailTableModel, PillarTableModel
+from app.ui.gui.workers import ImportWorker, OptimizeWorker
+
+try:
+    from app.ui.gui.pg_canvas import PgDiagramCanvas # Diagramas interativos (pyqtgraph opcional)
+except ImportError:
+    PgDiagramCanvas = None
+
+# Os kernels paralelos do Numba rodam nos workers (QThread)
+prefer_threadsafe_layer()
+
+@contextmanager
+def _bulk_update(widget):
+    """
+    Congela repintura, ordenação e sinais do widget durante um preenchimento em lote:
+    um único repaint ao final, em vez de um por linha.
+    """
+    sorting = widget.isSortingEnabled() if hasattr(widget, 'isSortingEnabled') else False
+    widget.setUpdatesEnabled(False)
+    if sorting:
+        widget.setSortingEnabled(False)
+    blocked = widget.blockSignals(True)
+    try:
+        yield widget
+    finally:
+        widget.blockSignals(blocked)
+        if sorting:
+            widget.setSortingEnabled(True)
+        widget.setUpdatesEnabled(True)
 
 # --- CANVAS PARA DIAGRAMAS (Aba 2) ---
+_TICK_STEPS = [1, 2, 2.5, 5, 10]
+
+def _padded(lo, hi, margin=0.05):
+    """Intervalo [lo, hi] com a margem relativa padrão do Matplotlib (faixa nula -> ±1)."""
+    lo, hi = float(lo), float(hi)
+    if hi <= lo:
+        return lo - 1.0, hi + 1.0
+    pad = (hi - lo) * margin
+    return lo - pad, hi + pad
+
 class MplCanvas(FigureCanvas):
     def __init__(self, parent=None, width=5, height=4, dpi=100):
-        self.fig = Figure(figsize=(width, height), dpi=dpi)
+        # constrained_layout: ajuste de margens feito no próprio draw (mais barato que tight_layout)
+        self.fig = Figure(figsize=(width, height), dpi=dpi, constrained_layout=True)
         self.axes_shear = self.fig.add_subplot(211)
         self.axes_moment = self.fig.add_subplot(212, sharex=self.axes_shear)
-        self.fig.tight_layout(pad=3.0)
         super(MplCanvas, self).__init__(self.fig)
 
+        # Elementos estáticos (configurados uma vez; entram no fundo salvo para blit)
+        self.axes_shear.set_ylabel("Cortante (kN)")
+        self.axes_shear.grid(True, alpha=0.3)
+        self.axes_moment.invert_yaxis()
+        self.axes_moment.set_ylabel("Momento (kNm)")
+        self.axes_moment.set_xlabel("Distância (m)")
+        self.axes_moment.grid(True, alpha=0.3)
+        # Limites definidos direto dos dados em update_diagrams (sem relim/autoscale);
+        # localizadores fixos, criados uma vez
+        for ax in (self.axes_shear, self.axes_moment):
+            ax.set_autoscale_on(False)
+            ax.xaxis.set_major_locator(MaxNLocator(nbins=6, steps=_TICK_STEPS))
+            ax.yaxis.set_major_locator(MaxNLocator(nbins=6, steps=_TICK_STEPS))
+
+        # Artistas persistentes (animated: fora do draw completo, desenhados sobre o fundo)
+        self.line_v, = self.axes_shear.plot([], [], 'b-', label='Cortante', animated=True)
+        self.line_m, = self.axes_moment.plot([], [], 'r-', label='Momento', animated=True)
+        self.fill_v = None
+        self.fill_m = None
+        self._backgrounds = None
+        self.mpl_connect('draw_event', self._on_draw)
+        self.mpl_connect('resize_event', self._on_resize)
+
+    def update_diagrams(self, x_vals, v_vals, m_vals, title):
+        """
+        Atualiza DEC/DMF reaproveitando os artistas.
+        Se limites e título não mudam, só as curvas são redesenhadas (blit);
+        caso contrário, agenda um redesenho completo (draw_idle).
+        """
+        ax_s, ax_m = self.axes_shear, self.axes_moment
+        old_view = self._view_state()
+
+        self.line_v.set_data(x_vals, v_vals)
+        self.line_m.set_data(x_vals, m_vals)
+        if self.fill_v is not None and hasattr(self.fill_v, 'set_data'):
+            # Matplotlib >= 3.10 (FillBetweenPolyCollection): só os vértices são trocados
+            self.fill_v.set_data(x_vals, v_vals, 0)
+            self.fill_m.set_data(x_vals, m_vals, 0)
+        else:
+            if self.fill_v is not None:
+                self.fill_v.remove()
+                self.fill_m.remove()
+            self.fill_v = ax_s.fill_between(x_vals, v_vals, 0, color='blue', alpha=0.1, animated=True)
+            self.fill_m = ax_m.fill_between(x_vals, m_vals, 0, color='red', alpha=0.1, animated=True)
+        # Mesmo enquadramento do autoscale: curva + faixa até o zero, margem de 5%
+        ax_s.set_xlim(*_padded(x_vals[0], x_vals[-1]))
+        ax_s.set_ylim(*_padded(min(v_vals.min(), 0.0), max(v_vals.max(), 0.0)))
+        m_lo, m_hi = _padded(min(m_vals.min(), 0.0), max(m_vals.max(), 0.0))
+        ax_m.set_ylim(m_hi, m_lo) # Eixo invertido (momento positivo para baixo)
+        ax_s.set_title(title)
+
+        if self._backgrounds is None or self._view_state() != old_view:
+            self.draw_idle()
+        else:
+            for bg in self._backgrounds:
+                self.restore_region(bg)
+            self._draw_animated()
+            self.blit(ax_s.bbox)
+            self.blit(ax_m.bbox)
+
+    def _view_state(self):
+        return (self.axes_shear.get_xlim(), self.axes_shear.get_ylim(),
+                self.axes_moment.get_ylim(), self.axes_shear.get_title())
+
+    def _on_draw(self, event):
+        # Após o draw completo: salva o fundo estático e desenha as curvas por cima
+        self._backgrounds = [self.copy_from_bbox(ax.bbox) for ax in (self.axes_shear, self.axes_moment)]
+        self._draw_animated()
+
+    def _on_resize(self, event):
+        # Fundo salvo com o tamanho antigo: o próximo update espera o redesenho completo
+        self._backgrounds = None
+
+    def _draw_animated(self):
+        for ax, fill, line in ((self.axes_shear, self.fill_v, self.line_v),
+                               (self.axes_moment, self.fill_m, self.line_m)):
+            if fill is not None:
+                ax.draw_artist(fill)
+            ax.draw_artist(line)
+
 # --- CANVAS PARA PLANTA DE FORMA (Aba 1 - Novo!) ---
+# Caixa dos rótulos da planta (Text.set_bbox copia o dict, pode ser compartilhado)
+_LABEL_BBOX = dict(facecolor='red', alpha=0.7, edgecolor='none')
+
 class StructuralViewCanvas(FigureCanvas):
     def __init__(self, parent=None, width=5, height=4, dpi=100):
-        self.fig = Figure(figsize=(width, height), dpi=dpi)
+        self.fig = Figure(figsize=(width, height), dpi=dpi, constrained_layout=True)
         self.ax = self.fig.add_subplot(111)
         self.ax.set_aspect('equal')
-        self.fig.tight_layout(pad=2.0)
         super(StructuralViewCanvas, self).__init__(self.fig)
+        self._plan_key = None # Geometria da última planta desenhada
+
+    @staticmethod
+    def _geometry_key(beams_dict):
+        return tuple((b_id, tuple((n.x, n.y, bool(n.support_conditions[0])) for n in beam.nodes))
+                     for b_id, beam in beams_dict.items())
 
     def plot_structure(self, beams_dict):
+        key = self._geometry_key(beams_dict)
+        if key == self._plan_key:
+            # Planta inalterada: o FigureCanvasQTAgg repinta a partir do buffer Agg já renderizado
+            self.update()
+            return
         self.ax.cla()
         
+        # Acumula a geometria de todas as vigas: uma coleção por tipo de elemento
+        polylines = []
+        supports = []
         for b_id, beam in beams_dict.items():
             if not beam.nodes: continue
             
-            x_coords = [n.x for n in beam.nodes]
-            y_coords = [n.y for n in beam.nodes]
-            
-            self.ax.plot(x_coords, y_coords, 'o-', linewidth=3, markersize=8, label=b_id, color='#2c3e50')
+            xy = np.array([(n.x, n.y) for n in beam.nodes], dtype=np.float64)
+            polylines.append(xy)
             
-            mid_x = np.mean(x_coords)
-            mid_y = np.mean(y_coords)
+            mid_x, mid_y = xy.mean(axis=0)
             self.ax.text(mid_x, mid_y, b_id, fontsize=10, fontweight='bold', 
-                         color='white', bbox=dict(facecolor='red', alpha=0.7, edgecolor='none'))
+                         color='white', bbox=_LABEL_BBOX)
             
-            for node in beam.nodes:
-                if node.support_conditions[0]: 
-                    self.ax.plot(node.x, node.y, '^', color='black', markersize=10)
+            supports.extend((n.x, n.y) for n in beam.nodes if n.support_conditions[0])
+
+        if polylines:
+            self.ax.add_collection(LineCollection(polylines, linewidths=3, colors='#2c3e50', zorder=2))
+            nodes = np.concatenate(polylines)
+            self.ax.scatter(nodes[:, 0], nodes[:, 1], s=64, c='#2c3e50', zorder=2)
+        if supports:
+            sup = np.array(supports, dtype=np.float64)
+            self.ax.scatter(sup[:, 0], sup[:, 1], marker='^', c='black', s=100, zorder=2)
 
         self.ax.set_title("Planta de Forma (Esquemática)")
         self.ax.set_xlabel("X (m)")
         self.ax.set_ylabel("Y (m)")
         self.ax.grid(True, linestyle='--', alpha=0.4)
-        self.draw()
+        self._plan_key = key
+        self.draw_idle()
 
 # --- JANELA PRINCIPAL ---
 class MainWindow(QMainWindow):
@@ -71,7 +214,19 @@ class MainWindow(QMainWindow):
         self.controller = BeamController()
         self.current_beams = {} 
         self.selected_beam_id = None
-        self.pillar_data_cache = [] # Armazena dados dos pilares para exportação
+        # Modelos das tabelas (os dados dos pilares para exportação ficam no pillar_model)
+        self.beam_model = BeamTableModel()
+        self.detail_model = DetailTableModel()
+        self.pillar_model = PillarTableModel()
+        self._beam_row_index = {} # ID da viga -> linha na tabela da Aba 1
+        self._opt_thread = None # QThread da otimização em andamento
+        self._opt_worker = None
+        self._opt_beam = None # Viga (original) em otimização
+        self._import_thread = None # QThread da importação em andamento
+        self._import_worker = None
+        self._draw_pending = False # Redesenho da viga selecionada já agendado (_schedule_draw)
+        self._batch_depth = 0 # Aninhamento de batch_updates()
+        self._batch_dirty = False # Algum redesenho foi pedido dentro do lote
 
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
@@ -125,9 +280,8 @@ class MainWindow(QMainWindow):
         btn_layout.addWidget(self.btn_import)
         left_layout.addLayout(btn_layout)
         
-        self.table_beams = QTableWidget()
-        self.table_beams.setColumnCount(5)
-        self.table_beams.setHorizontalHeaderLabels(["ID", "Seção", "Comp. (m)", "Carga Total", "Status"])
+        self.table_beams = QTableView()
+        self.table_beams.setModel(self.beam_model)
         self.table_beams.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         left_layout.addWidget(self.table_beams)
         
@@ -157,7 +311,8 @@ class MainWindow(QMainWindow):
         left_layout = QVBoxLayout(left_panel)
         left_layout.addWidget(QLabel("<b>Selecione a Viga:</b>"))
         self.list_beams = QListWidget()
-        self.list_beams.itemClicked.connect(self._on_beam_selected)
+        self.list_beams.setUniformItemSizes(True) # Itens de uma linha: o layout não mede item a item
+        self.list_beams.currentItemChanged.connect(self._on_beam_selected) # Só dispara quando a seleção muda
         left_layout.addWidget(self.list_beams)
         left_panel.setLayout(left_layout)
         
@@ -165,8 +320,11 @@ class MainWindow(QMainWindow):
         right_panel = QWidget()
         right_layout = QVBoxLayout(right_panel)
         
-        # Gráficos
-        self.canvas = MplCanvas(self, width=5, height=5, dpi=100)
+        # Gráficos (pyqtgraph se disponível; senão Matplotlib)
+        if PgDiagramCanvas is not None:
+            self.canvas = PgDiagramCanvas(self)
+        else:
+            self.canvas = MplCanvas(self, width=5, height=5, dpi=100)
         right_layout.addWidget(self.canvas, stretch=2)
         
         # Ferramentas
@@ -203,9 +361,8 @@ class MainWindow(QMainWindow):
         
         # Detalhes
         right_layout.addWidget(QLabel("<b>Resultados Detalhados:</b>"))
-        self.table_detail = QTableWidget()
-        self.table_detail.setColumnCount(4)
-        self.table_detail.setHorizontalHeaderLabels(["Posição", "Armadura", "Área (cm²)", "Status"])
+        self.table_detail = QTableView()
+        self.table_detail.setModel(self.detail_model)
         self.table_detail.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         right_layout.addWidget(self.table_detail, stretch=1)
         
@@ -229,9 +386,8 @@ class MainWindow(QMainWindow):
         layout.addLayout(header)
         
         # Tabela de Pilares
-        self.table_pillars = QTableWidget()
-        self.table_pillars.setColumnCount(6)
-        self.table_pillars.setHorizontalHeaderLabels(["ID Pilar (Editável)", "Coord (X,Y)", "Fz (kN)", "Mx (kNm)", "My (kNm)", "Origem"])
+        self.table_pillars = QTableView()
+        self.table_pillars.setModel(self.pillar_model)
         self.table_pillars.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         layout.addWidget(self.table_pillars)
         
@@ -254,66 +410,154 @@ class MainWindow(QMainWindow):
     # --- LÓGICA DO SISTEMA ---
 
     def _import_json(self):
+        if self._import_thread is not None: return
         file_path, _ = QFileDialog.getOpenFileName(self, "Abrir JSON", "", "JSON (*.json)")
         if file_path:
-            try:
-                self.current_beams = self.controller.run_batch_analysis(file_path)
-                self._update_ui_after_import()
-                self.structure_canvas.plot_structure(self.current_beams)
-                
-                if self.list_beams.count() > 0:
-                    self.list_beams.setCurrentRow(0)
-                    self._on_beam_selected(self.list_beams.item(0))
-                
-                self.statusBar().showMessage(f"Importado: {len(self.current_beams)} vigas.")
-            except Exception as e:
-                QMessageBox.critical(self, "Erro", str(e))
-
-    def _update_ui_after_import(self):
-        # Aba 1
-        self.table_beams.setRowCount(0)
-        for row, (b_id, beam) in enumerate(self.current_beams.items()):
-            self.table_beams.insertRow(row)
-            self.table_beams.setItem(row, 0, QTableWidgetItem(b_id))
-            
-            sec = f"{beam.spans[0].section.bw}x{beam.spans[0].section.h}"
-            self.table_beams.setItem(row, 1, QTableWidgetItem(sec))
+            # Leitura + análise do lote em QThread: a interface segue pintando
+            worker = ImportWorker(self.controller, file_path)
+            self._import_thread = self._start_worker(worker, self._on_import_done,
+                                                     self._on_import_failed, self._on_import_thread_finished)
+            self._import_worker = worker
+            self.btn_import.setEnabled(False)
+            self.statusBar().showMessage("Importando...")
+
+    def _on_import_done(self, beams):
+        try:
+            self.current_beams = beams
+            self.selected_beam_id = None # IDs podem se repetir entre projetos: a 1ª viga é redesenhada
+            self._populate_tables(self.current_beams)
+            # Planta e 1ª viga após o retorno do slot: tabelas e diálogo pintam primeiro
+            QTimer.singleShot(0, self._show_imported_project)
             
-            comp = sum(s.length for s in beam.spans)
-            self.table_beams.setItem(row, 2, QTableWidgetItem(f"{comp:.2f}"))
+            self.statusBar().showMessage(f"Importado: {len(self.current_beams)} vigas.")
+        except Exception as e:
+            QMessageBox.critical(self, "Erro", str(e))
+
+    def _on_import_failed(self, message):
+        self.statusBar().clearMessage()
+        QMessageBox.critical(self, "Erro", message)
+
+    def _on_import_thread_finished(self):
+        self._import_worker.deleteLater()
+        self._import_thread.deleteLater()
+        self._import_thread = self._import_worker = None
+        self.btn_import.setEnabled(True)
+
+    def _start_worker(self, worker, on_done, on_failed, on_thread_finished):
+        """
+        Executa worker.run() em uma nova QThread.
+        Os sinais finished/failed chegam à janela na thread da GUI (conexão enfileirada).
+        """
+        thread = QThread(self)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.finished.connect(on_done)
+        worker.failed.connect(on_failed)
+        worker.finished.connect(thread.quit)
+        worker.failed.connect(thread.quit)
+        thread.finished.connect(on_thread_finished)
+        thread.start()
+        return thread
+
+    def _show_imported_project(self):
+        try:
+            self.structure_canvas.plot_structure(self.current_beams)
             
-            try:
-                total_load = 0
-                for span in beam.spans:
-                    q = sum(l.value for l in span.loads if l.load_type == LoadType.DISTRIBUTED)
-                    total_load += q * span.length
-                self.table_beams.setItem(row, 3, QTableWidgetItem(f"{total_load:.1f}"))
-            except:
-                 self.table_beams.setItem(row, 3, QTableWidgetItem("-"))
+            if self.list_beams.count() > 0:
+                self.list_beams.setCurrentRow(0)
+                self._on_beam_selected(self.list_beams.item(0))
+        except Exception as e:
+            QMessageBox.critical(self, "Erro", str(e))
 
-            self.table_beams.setItem(row, 4, QTableWidgetItem("Calculado"))
+    def _populate_tables(self, beams):
+        """Reconstrói a tabela da Aba 1 e a lista da Aba 2 (após importação)."""
+        # Aba 1 (o modelo formata as células sob demanda)
+        rows = [self._beam_row(b_id, beam) for b_id, beam in beams.items()]
+        self._beam_row_index = {b_id: i for i, b_id in enumerate(beams)}
+        with _bulk_update(self.table_beams):
+            self.beam_model.set_rows(rows)
 
         # Aba 2
-        self.list_beams.clear()
-        for b_id in self.current_beams.keys():
-            self.list_beams.addItem(b_id)
+        with _bulk_update(self.list_beams):
+            self.list_beams.clear()
+            self.list_beams.addItems(list(beams.keys()))
+
+    def _update_beam_row(self, beam_id):
+        """Atualiza só a linha da viga editada na Aba 1 (lista e seleção ficam intactas)."""
+        row = self._beam_row_index.get(beam_id)
+        if row is None:
+            self._populate_tables(self.current_beams)
+            return
+        self.beam_model.set_row(row, self._beam_row(beam_id, self.current_beams[beam_id]))
+
+    def _beam_row(self, b_id, beam):
+        section = beam.spans[0].section
+        # Espelho SoA da viga (já consolidado na análise): comprimentos e q distribuído por vão
+        beam.ensure_soa()
+        L = beam._span_L
+        total_load = float(L @ beam._span_q)
 
-    def _on_beam_selected(self, item):
-        if not item: return
+        return {
+            'id': b_id,
+            'bw': section.bw,
+            'h': section.h,
+            'length': float(L.sum()),
+            'total_load': total_load,
+            'status': "Calculado",
+        }
+
+    def _on_beam_selected(self, item, previous=None):
+        # Mesma viga já exibida (ex.: chamada direta após setCurrentRow): nada a redesenhar
+        if not item or item.text() == self.selected_beam_id: return
         self.selected_beam_id = item.text()
         beam = self.current_beams[self.selected_beam_id]
         
-        first_span = beam.spans[0]
-        self.spin_bw.setValue(int(first_span.section.bw))
-        self.spin_h.setValue(int(first_span.section.h))
+        section = beam.spans[0].section
+        nodes = beam.nodes
+        self.spin_bw.setValue(int(section.bw))
+        self.spin_h.setValue(int(section.h))
         
-        node_start = beam.nodes[0]
-        node_end = beam.nodes[-1]
-        self.chk_fix_start.setChecked(node_start.support_conditions[1])
-        self.chk_fix_end.setChecked(node_end.support_conditions[1])
+        self.chk_fix_start.setChecked(nodes[0].support_conditions[1])
+        self.chk_fix_end.setChecked(nodes[-1].support_conditions[1])
         
         self.group_edit.setEnabled(True)
-        self._refresh_visualization(beam)
+        # Navegação rápida pela lista (ex.: setas do teclado): só a última seleção é desenhada
+        self._schedule_draw()
+
+    @contextmanager
+    def batch_updates(self):
+        """
+        Agrupa várias edições programáticas: dentro do bloco (reentrante) os redesenhos
+        só são anotados, e um único redesenho é agendado ao sair do bloco mais externo.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._batch_dirty:
+                self._batch_dirty = False
+                self._schedule_draw()
+
+    def _schedule_draw(self):
+        """Agenda um único redesenho da viga selecionada (coalesce eventos seguidos em ~1 quadro)."""
+        if self._batch_depth:
+            self._batch_dirty = True
+            return
+        if self._draw_pending: return
+        self._draw_pending = True
+        QTimer.singleShot(16, self._do_draw)
+
+    def _do_draw(self):
+        if not self._draw_pending: return # Já redesenhada diretamente (_refresh_visualization)
+        beam = self.current_beams.get(self.selected_beam_id)
+        if beam is None:
+            self._draw_pending = False
+            return
+        try:
+            self._refresh_visualization(beam)
+        except Exception as e:
+            QMessageBox.critical(self, "Erro", str(e))
 
     def _manual_update(self):
         if not self.selected_beam_id: return
@@ -330,127 +574,105 @@ class MainWindow(QMainWindow):
             for load in span.loads:
                 if load.source == "Peso Próprio":
                     load.value = (new_bw/100) * (new_h/100) * 25.0
+            span.invalidate_load_cache()
         
         beam.nodes[0].support_conditions[1] = is_fixed_start
         beam.nodes[-1].support_conditions[1] = is_fixed_end
         
         try:
             self.controller._process_single_beam(beam)
-            self._refresh_visualization(beam)
-            self._update_ui_after_import()
+            if self._batch_depth:
+                self._batch_dirty = True
+            else:
+                self._refresh_visualization(beam)
+            self._update_beam_row(beam.id)
             self.statusBar().showMessage(f"Viga {beam.id} atualizada!", 3000)
         except Exception as e:
             QMessageBox.critical(self, "Erro", str(e))
 
     def _refresh_visualization(self, beam):
-        self.canvas.axes_shear.cla()
-        self.canvas.axes_moment.cla()
+        self._draw_pending = False
+        # Só as curvas são recalculadas; o canvas reaproveita eixos e fundo (blit)
+        x_vals, v_vals, m_vals = BeamPlotter.diagram_points(beam)
         
-        x_vals, v_vals, m_vals = [], [], []
-        curr_x = 0
+        self.canvas.update_diagrams(x_vals, v_vals, m_vals, f"Diagramas: {beam.id}")
         
-        for span in beam.spans:
-            L = span.length
-            x = np.linspace(0, L, 50)
-            
-            V_esq = span.shear_left
-            M_esq = span.moment_left
-            q = sum(l.value for l in span.loads if l.load_type == LoadType.DISTRIBUTED)
-            
-            V = V_esq - q * x
-            M = M_esq + V_esq * x - (q * x**2) / 2
-            
-            x_vals.extend(curr_x + x)
-            v_vals.extend(V)
-            m_vals.extend(M)
-            curr_x += L
-        
-        self.canvas.axes_shear.plot(x_vals, v_vals, 'b-', label='Cortante')
-        self.canvas.axes_shear.fill_between(x_vals, v_vals, 0, color='blue', alpha=0.1)
-        self.canvas.axes_shear.set_ylabel("Cortante (kN)")
-        self.canvas.axes_shear.grid(True, alpha=0.3)
-        self.canvas.axes_shear.set_title(f"Diagramas: {beam.id}")
-        
-        self.canvas.axes_moment.plot(x_vals, m_vals, 'r-', label='Momento')
-        self.canvas.axes_moment.fill_between(x_vals, m_vals, 0, color='red', alpha=0.1)
-        self.canvas.axes_moment.invert_yaxis()
-        self.canvas.axes_moment.set_ylabel("Momento (kNm)")
-        self.canvas.axes_moment.set_xlabel("Distância (m)")
-        self.canvas.axes_moment.grid(True, alpha=0.3)
-        self.canvas.draw()
-        
-        self.table_detail.setRowCount(0)
-        for i, span in enumerate(beam.spans):
+        detail_rows = []
+        extend = detail_rows.extend
+        for i, span in enumerate(beam.spans, 1):
             det = getattr(span, 'detailing_results', None)
             if not det: continue
             
-            self._add_detail_row(f"Vão {i+1} Positiva", det['positive'])
-            self._add_detail_row(f"Vão {i+1} Estribos", det['stirrups'], is_stirrup=True)
-            self._add_detail_row(f"Apoio Esq (Neg)", det['negative_left'])
-            self._add_detail_row(f"Apoio Dir (Neg)", det['negative_right'])
-
-    def _add_detail_row(self, label, data, is_stirrup=False):
-        row = self.table_detail.rowCount()
-        self.table_detail.insertRow(row)
-        
-        if is_stirrup:
-            desc = f"Ø{data.diameter_mm} c/{data.spacing_cm}"
-            area = "-"
-        else:
-            if data.count > 0:
-                desc = f"{data.count} Ø{data.diameter_mm}"
-                if hasattr(data, 'anchorage_length_cm') and data.anchorage_length_cm > 0:
-                     desc += f" (Lb={data.anchorage_length_cm})"
-                area = f"{data.area_provided_cm2:.2f}"
-            else:
-                desc = "Mínima"
-                area = "0.00"
-                
-        self.table_detail.setItem(row, 0, QTableWidgetItem(label))
-        self.table_detail.setItem(row, 1, QTableWidgetItem(desc))
-        self.table_detail.setItem(row, 2, QTableWidgetItem(area))
-        
-        item_status = QTableWidgetItem(data.status)
-        if "OK" in data.status:
-            item_status.setForeground(QColor("green"))
-        else:
-            item_status.setForeground(QColor("red"))
-        self.table_detail.setItem(row, 3, item_status)
+            extend(((f"Vão {i} Positiva", det['positive'], False),
+                    (f"Vão {i} Estribos", det['stirrups'], True),
+                    ("Apoio Esq (Neg)", det['negative_left'], False),
+                    ("Apoio Dir (Neg)", det['negative_right'], False)))
+        with _bulk_update(self.table_detail):
+            self.detail_model.set_rows(detail_rows)
 
     def _run_optimization_gui(self):
-        if not self.selected_beam_id: return
-        from app.engines.optimizer import OptimizerEngine
-        optimizer = OptimizerEngine()
+        if not self.selected_beam_id or self._opt_thread is not None: return
         beam = self.current_beams[self.selected_beam_id]
         
-        from PyQt6.QtWidgets import QApplication
-        QApplication.processEvents()
+        # Otimização em QThread: a interface continua respondendo durante a varredura
+        worker = OptimizeWorker(beam)
+        self._opt_worker, self._opt_beam = worker, beam
+        self._opt_thread = self._start_worker(worker, self._on_optimization_done,
+                                              self._on_optimization_failed, self._on_optimization_thread_finished)
+        self.btn_optimize.setEnabled(False)
+        self.statusBar().showMessage(f"Otimizando {beam.id}...")
+
+    def _on_optimization_thread_finished(self):
+        self._opt_worker.deleteLater()
+        self._opt_thread.deleteLater()
+        self._opt_thread = self._opt_worker = self._opt_beam = None
+        self.btn_optimize.setEnabled(True)
+
+    def _on_optimization_failed(self, message):
+        self.statusBar().clearMessage()
+        QMessageBox.critical(self, "Erro", message)
+
+    def _on_optimization_done(self, report):
+        beam = self._opt_beam # Capturado já: o diálogo abaixo processa eventos (fim da thread)
+        self.statusBar().clearMessage()
+        if "error" in report:
+            QMessageBox.warning(self, "Aviso", report["error"])
+            return
         
         try:
-            report = optimizer.optimize_beam(beam)
-            if "error" in report:
-                QMessageBox.warning(self, "Aviso", report["error"])
-                return
-            
             orig = report["original"]
             best = report["best"]
-            
+
+            # Seção original pode não ter solução viável (orig = None): só a melhor é exibida
+            items = []
+            if orig is not None:
+                items.append(f"<li>Custo Atual: R$ {orig['cost']:.2f}</li>")
+            items.append(f"<li>Custo Otimizado: R$ {best['cost']:.2f}</li>")
+            if orig is not None:
+                items.append(f"<li><b>Economia: R$ {orig['cost'] - best['cost']:.2f}</b></li>")
+
             msg = (f"<h3>Resultado da Otimização</h3>"
                    f"A altura ideal encontrada foi <b>{best['h']} cm</b>.<br><br>"
-                   f"<ul>"
-                   f"<li>Custo Atual: R$ {orig['cost']:.2f}</li>"
-                   f"<li>Custo Otimizado: R$ {best['cost']:.2f}</li>"
-                   f"<li><b>Economia: R$ {orig['cost'] - best['cost']:.2f}</b></li>"
-                   f"</ul>"
+                   f"<ul>{''.join(items)}</ul>"
                    f"Deseja aplicar essa seção agora?")
-            
-            reply = QMessageBox.question(self, "Otimização", msg, 
+
+            reply = QMessageBox.question(self, "Otimização", msg,
                                          QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
-            
-            if reply == QMessageBox.StandardButton.Yes:
+
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+            # A viga pode ter sido substituída (nova importação) durante a otimização
+            if self.current_beams.get(beam.id) is not beam:
+                QMessageBox.warning(self, "Aviso", f"A viga {beam.id} não está mais carregada.")
+                return
+            # Seleção + nova altura + recálculo: um único redesenho ao final
+            with self.batch_updates():
+                if self.selected_beam_id != beam.id:
+                    row = self._beam_row_index[beam.id]
+                    self.list_beams.setCurrentRow(row)
+                    self._on_beam_selected(self.list_beams.item(row))
                 self.spin_h.setValue(int(best['h']))
                 self._manual_update()
-                
         except Exception as e:
             QMessageBox.critical(self, "Erro", str(e))
 
@@ -466,60 +688,24 @@ class MainWindow(QMainWindow):
         exporter = DataExporter()
         
         try:
-            # Obtém os dados (lista de dicts)
-            self.pillar_data_cache = exporter.calculate_reactions(self.current_beams)
-            
-            # Preenche a Tabela
-            self.table_pillars.setRowCount(0)
-            for row, p in enumerate(self.pillar_data_cache):
-                self.table_pillars.insertRow(row)
-                
-                # ID (Editável)
-                self.table_pillars.setItem(row, 0, QTableWidgetItem(p['id_estimado']))
-                
-                # Coord (Apenas leitura)
-                coord_str = f"({p['coordenada']['x']}, {p['coordenada']['y']})"
-                item_coord = QTableWidgetItem(coord_str)
-                item_coord.setFlags(item_coord.flags() ^ Qt.ItemFlag.ItemIsEditable) # Bloqueia edição
-                self.table_pillars.setItem(row, 1, item_coord)
-                
-                # Fz
-                self.table_pillars.setItem(row, 2, QTableWidgetItem(str(p['cargas_servico']['Fz_kN'])))
-                
-                # Mx, My (Novas colunas para engaste!)
-                self.table_pillars.setItem(row, 3, QTableWidgetItem(str(p['cargas_servico']['Mx_kNm'])))
-                self.table_pillars.setItem(row, 4, QTableWidgetItem(str(p['cargas_servico']['My_kNm'])))
-                
-                # Origem
-                origem_str = ", ".join(p['origem_cargas'])
-                self.table_pillars.setItem(row, 5, QTableWidgetItem(origem_str))
+            # Obtém os dados (lista de dicts) e entrega ao modelo da tabela
+            pillars = exporter.calculate_reactions(self.current_beams)
+            with _bulk_update(self.table_pillars):
+                self.pillar_model.set_rows(pillars)
             
-            self.statusBar().showMessage(f"Carregados {len(self.pillar_data_cache)} pilares.")
+            self.statusBar().showMessage(f"Carregados {self.pillar_model.rowCount()} pilares.")
             
         except Exception as e:
             QMessageBox.critical(self, "Erro ao calcular pilares", str(e))
 
     def _export_pillars_json(self):
-        """Lê a tabela (com nomes editados) e salva o JSON."""
-        if self.table_pillars.rowCount() == 0:
+        """Salva o JSON dos pilares (com os nomes editados na tabela)."""
+        if self.pillar_model.rowCount() == 0:
             QMessageBox.warning(self, "Aviso", "Carregue a tabela primeiro (Botão 'Calcular Reações').")
             return
             
-        # Reconstrói a lista de dados a partir da tabela editada
-        export_data = []
-        for row in range(self.table_pillars.rowCount()):
-            # Lê o ID que o usuário pode ter editado
-            new_id = self.table_pillars.item(row, 0).text()
-            
-            # Recupera os dados originais do cache para não perder precisão ou outros campos
-            # Assume que a ordem das linhas não mudou
-            original_data = self.pillar_data_cache[row]
-            
-            # Cria cópia e atualiza ID
-            pillar_entry = original_data.copy()
-            pillar_entry['id_estimado'] = new_id
-            
-            export_data.append(pillar_entry)
+        # As edições do ID já foram gravadas pelo modelo nos dicts das linhas
+        export_data = self.pillar_model.rows()
             
         # Salva
         file_path, _ = QFileDialog.getSaveFileName(self, "Salvar JSON de Pilares", "pilares_input.json", "JSON (*.json)")
@@ -544,58 +730,60 @@ class MainWindow(QMainWindow):
             return
 
         try:
-            text = "# MEMORIAL DE CÁLCULO ESTRUTURAL\n"
-            text += "Norma: NBR 6118:2023\n"
-            text += "="*60 + "\n\n"
+            # Trechos acumulados em lista e gravados de uma vez (sem concatenação repetida)
+            parts = ["# MEMORIAL DE CÁLCULO ESTRUTURAL\n",
+                     "Norma: NBR 6118:2023\n",
+                     "="*60 + "\n\n"]
+            add = parts.append
             
             for b_id, beam in self.current_beams.items():
-                text += f"## VIGA: {b_id}\n"
+                add(f"## VIGA: {b_id}\n")
                 if beam.spans:
-                    text += f"* Seção: {beam.spans[0].section.bw} x {beam.spans[0].section.h} cm\n"
-                text += f"* Vãos: {len(beam.spans)}\n"
-                text += "-"*40 + "\n"
+                    add(f"* Seção: {beam.spans[0].section.bw} x {beam.spans[0].section.h} cm\n")
+                add(f"* Vãos: {len(beam.spans)}\n")
+                add("-"*40 + "\n")
                 
                 for i, span in enumerate(beam.spans):
                     det = getattr(span, 'detailing_results', None)
-                    res = getattr(span, 'design_results', {})
+                    res = span.design_results
                     els = getattr(span, 'els_results', None)
                     
-                    text += f"### Vão {i+1} (L = {span.length:.2f} m)\n\n"
+                    add(f"### Vão {i+1} (L = {span.length:.2f} m)\n\n")
                     
                     if res:
-                        text += f"**1. Solicitações (ELU):**\n"
-                        text += f"- Md máx: {res.get('Md_max', 0):.2f} kNm\n"
-                        text += f"- Vsd máx: {res.get('V_sd', 0):.2f} kN\n\n"
+                        add(f"**1. Solicitações (ELU):**\n")
+                        add(f"- Md máx: {res.Md_max:.2f} kNm\n")
+                        add(f"- Vsd máx: {res.V_sd:.2f} kN\n\n")
                     
                     if els:
-                        text += f"**2. Verificação (ELS):**\n"
-                        text += f"- Flecha Total: {els.deflection_total:.2f} mm (Limite: {els.deflection_limit:.2f} mm) -> {els.status_deflection}\n"
-                        text += f"- Fissuração: {els.wk_calc:.3f} mm (Limite: {els.wk_limit} mm) -> {els.status_crack}\n\n"
+                        add(f"**2. Verificação (ELS):**\n")
+                        add(f"- Flecha Total: {els.deflection_total:.2f} mm (Limite: {els.deflection_limit:.2f} mm) -> {els.status_deflection}\n")
+                        add(f"- Fissuração: {els.wk_calc:.3f} mm (Limite: {els.wk_limit} mm) -> {els.status_crack}\n\n")
                     
                     if det:
-                        text += f"**3. Detalhamento:**\n"
+                        add(f"**3. Detalhamento:**\n")
                         pos = det['positive']
                         est = det['stirrups']
-                        text += f"- Positiva: {pos.count} Ø{pos.diameter_mm:.1f} mm (As ef: {pos.area_provided_cm2:.2f} cm²)\n"
-                        if hasattr(pos, 'anchorage_length_cm') and pos.anchorage_length_cm > 0:
-                            text += f"  - Lb nec: {pos.anchorage_length_cm} cm\n"
+                        add(f"- Positiva: {pos.count} Ø{pos.diameter_mm:.1f} mm (As ef: {pos.area_provided_cm2:.2f} cm²)\n")
+                        if pos.anchorage_length_cm > 0:
+                            add(f"  - Lb nec: {pos.anchorage_length_cm} cm\n")
                         
-                        text += f"- Estribos: Ø{est.diameter_mm:.1f} c/{est.spacing_cm} cm\n"
+                        add(f"- Estribos: Ø{est.diameter_mm:.1f} c/{est.spacing_cm} cm\n")
                         
                         neg_esq = det['negative_left']
                         if neg_esq.count > 0:
-                             text += f"- Neg. Esq: {neg_esq.count} Ø{neg_esq.diameter_mm:.1f} mm\n"
+                             add(f"- Neg. Esq: {neg_esq.count} Ø{neg_esq.diameter_mm:.1f} mm\n")
 
                         neg_dir = det['negative_right']
                         if neg_dir.count > 0:
-                             text += f"- Neg. Dir: {neg_dir.count} Ø{neg_dir.diameter_mm:.1f} mm\n"
+                             add(f"- Neg. Dir: {neg_dir.count} Ø{neg_dir.diameter_mm:.1f} mm\n")
                     
-                    text += "\n" + "-"*40 + "\n"
+                    add("\n" + "-"*40 + "\n")
                 
-                text += "\n" + "="*60 + "\n\n"
+                add("\n" + "="*60 + "\n\n")
 
             with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(text)
+                f.writelines(parts)
             QMessageBox.information(self, "Sucesso", f"Memorial salvo em:\n{file_path}")
             
         except Exception as e:
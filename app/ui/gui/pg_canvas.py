@@ -0,0 +1,45 @@
+"""
+Canvas dos diagramas (DEC/DMF) em pyqtgraph (dependência opcional).
+Desenha direto via QPainter, sem rasterizar a figura inteira (Agg) a cada seleção;
+mesma interface de MplCanvas: update_diagrams(x, V, M, título).
+"""
+import numpy as np
+import pyqtgraph as pg
+
+pg.setConfigOptions(antialias=False)
+
+# Preenchimentos equivalentes a alpha=0.1 do Matplotlib
+_FILL_SHEAR = (0, 0, 255, 26)
+_FILL_MOMENT = (255, 0, 0, 26)
+
+class PgDiagramCanvas(pg.GraphicsLayoutWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setBackground('w')
+
+        self.plot_shear = self.addPlot(row=0, col=0)
+        self.plot_moment = self.addPlot(row=1, col=0)
+        self.plot_moment.setXLink(self.plot_shear)
+
+        self.plot_shear.setLabel('left', "Cortante (kN)")
+        self.plot_shear.showGrid(x=True, y=True, alpha=0.3)
+        self.plot_moment.setLabel('left', "Momento (kNm)")
+        self.plot_moment.setLabel('bottom', "Distância (m)")
+        self.plot_moment.showGrid(x=True, y=True, alpha=0.3)
+        self.plot_moment.invertY(True)
+
+        # Curvas persistentes: cada atualização só troca os dados (setData)
+        self.curve_v = self.plot_shear.plot(pen='b')
+        self.curve_m = self.plot_moment.plot(pen='r')
+        self._zero_v = self.plot_shear.plot(pen=None)
+        self._zero_m = self.plot_moment.plot(pen=None)
+        self.plot_shear.addItem(pg.FillBetweenItem(self.curve_v, self._zero_v, brush=_FILL_SHEAR))
+        self.plot_moment.addItem(pg.FillBetweenItem(self.curve_m, self._zero_m, brush=_FILL_MOMENT))
+
+    def update_diagrams(self, x_vals, v_vals, m_vals, title):
+        zeros = np.zeros_like(x_vals)
+        self._zero_v.setData(x_vals, zeros)
+        self._zero_m.setData(x_vals, zeros)
+        self.curve_v.setData(x_vals, v_vals)
+        self.curve_m.setData(x_vals, m_vals)
+        self.plot_shear.setTitle(title)
@@ -0,0 +1,167 @@
+"""
+Modelos de tabela da GUI (arquitetura Model/View do Qt).
+Os dados ficam em listas Python simples; o texto de cada célula é formatado
+sob demanda em data(), apenas para as células que o QTableView desenha.
+"""
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QColor
+
+_DISPLAY = Qt.ItemDataRole.DisplayRole
+_EDIT = Qt.ItemDataRole.EditRole
+_FOREGROUND = Qt.ItemDataRole.ForegroundRole
+
+# Cores do status (criadas uma vez, a partir das cores predefinidas do Qt)
+_COLOR_OK = QColor(Qt.GlobalColor.darkGreen)
+_COLOR_BAD = QColor(Qt.GlobalColor.red)
+
+class _RowTableModel(QAbstractTableModel):
+    """
+    Base: uma linha por item de self._rows.
+    As subclasses definem HEADERS e _display(row, col) (e opcionalmente _foreground).
+    """
+    HEADERS = ()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+
+    def set_rows(self, rows):
+        """Substitui todo o conteúdo (um único reset em vez de N inserções)."""
+        self.beginResetModel()
+        self._rows = list(rows)
+        self.endResetModel()
+
+    def set_row(self, row, value):
+        """Substitui uma única linha e notifica só as células dela."""
+        self._rows[row] = value
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+
+    def rows(self):
+        return self._rows
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=_DISPLAY):
+        if role == _DISPLAY and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=_DISPLAY):
+        if not index.isValid():
+            return None
+        if role == _DISPLAY or role == _EDIT:
+            return self._display(self._rows[index.row()], index.column())
+        if role == _FOREGROUND:
+            return self._foreground(self._rows[index.row()], index.column())
+        return None
+
+    def _display(self, row, col):
+        raise NotImplementedError
+
+    def _foreground(self, row, col):
+        return None
+
+class BeamTableModel(_RowTableModel):
+    """Aba 1. Linhas: dicts com id, bw, h, length, total_load (None = indisponível) e status."""
+    HEADERS = ("ID", "Seção", "Comp. (m)", "Carga Total", "Status")
+
+    def _display(self, row, col):
+        if col == 0:
+            return row['id']
+        if col == 1:
+            return f"{row['bw']}x{row['h']}"
+        if col == 2:
+            return f"{row['length']:.2f}"
+        if col == 3:
+            return "-" if row['total_load'] is None else f"{row['total_load']:.1f}"
+        return row['status']
+
+class DetailTableModel(_RowTableModel):
+    """Aba 2. Linhas: tuplas (rótulo, BarOption/StirrupOption, is_stirrup)."""
+    HEADERS = ("Posição", "Armadura", "Área (cm²)", "Status")
+
+    def _display(self, row, col):
+        label, data, is_stirrup = row
+        if col == 0:
+            return label
+        if col == 3:
+            return data.status
+
+        if is_stirrup:
+            return f"Ø{data.diameter_mm} c/{data.spacing_cm}" if col == 1 else "-"
+
+        if data.count > 0:
+            if col == 1:
+                # BarOption.anchorage_length_cm vale 0.0 quando não há ancoragem calculada
+                lb = data.anchorage_length_cm
+                return f"{data.count} Ø{data.diameter_mm}" + (f" (Lb={lb})" if lb > 0 else "")
+            return f"{data.area_provided_cm2:.2f}"
+        return "Mínima" if col == 1 else "0.00"
+
+    def _foreground(self, row, col):
+        if col != 3:
+            return None
+        return _COLOR_OK if "OK" in row[1].status else _COLOR_BAD
+
+class PillarTableModel(_RowTableModel):
+    """
+    Aba 3. Linhas: os dicts de DataExporter.calculate_reactions.
+    Só a coluna do ID é editável; a edição é gravada direto no dict da linha.
+    """
+    HEADERS = ("ID Pilar (Editável)", "Coord (X,Y)", "Fz (kN)", "Mx (kNm)", "My (kNm)", "Origem")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._texts = []
+
+    def set_rows(self, rows):
+        # Textos das colunas fixas (1 a 5), formatados na primeira vez que a linha é desenhada
+        self._texts = [None] * len(rows)
+        super().set_rows(rows)
+
+    def set_row(self, row, value):
+        self._texts[row] = None
+        super().set_row(row, value)
+
+    def data(self, index, role=_DISPLAY):
+        if role == _DISPLAY and index.isValid() and index.column() > 0:
+            r = index.row()
+            texts = self._texts[r]
+            if texts is None:
+                texts = self._texts[r] = self._format(self._rows[r])
+            return texts[index.column() - 1]
+        return super().data(index, role)
+
+    @staticmethod
+    def _format(row):
+        coord = row['coordenada']
+        cargas = row['cargas_servico']
+        return (
+            f"({coord['x']}, {coord['y']})",
+            str(cargas['Fz_kN']),
+            str(cargas['Mx_kNm']),
+            str(cargas['My_kNm']),
+            ", ".join(row['origem_cargas']),
+        )
+
+    def _display(self, row, col):
+        if col == 0:
+            return row['id_estimado']
+        return self._format(row)[col - 1]
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and index.column() == 0:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=_EDIT):
+        if role != _EDIT or not index.isValid() or index.column() != 0:
+            return False
+        self._rows[index.row()]['id_estimado'] = str(value)
+        self.dataChanged.emit(index, index, [_DISPLAY, _EDIT])
+        return True
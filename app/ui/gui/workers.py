@@ -0,0 +1,46 @@
+"""
+Workers de segundo plano da GUI (executados em QThread).
+O cálculo roda fora do laço de eventos do Qt; o resultado volta à janela por sinal.
+"""
+import copy
+from PyQt6.QtCore import QObject, pyqtSignal
+
+class ImportWorker(QObject):
+    """Lê o JSON do PyLaje e processa o lote (BeamController.run_batch_analysis)."""
+    finished = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+    def __init__(self, controller, file_path):
+        super().__init__()
+        self.controller = controller
+        self.file_path = file_path
+
+    def run(self):
+        try:
+            beams = self.controller.run_batch_analysis(self.file_path)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.finished.emit(beams)
+
+class OptimizeWorker(QObject):
+    """
+    Otimiza a altura de uma viga.
+    Trabalha sobre uma cópia: as tentativas do otimizador alteram a viga temporariamente,
+    e a original continua sendo lida pela GUI durante a execução.
+    """
+    finished = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+    def __init__(self, beam):
+        super().__init__()
+        self.beam = copy.deepcopy(beam)
+
+    def run(self):
+        from app.engines.optimizer import OptimizerEngine
+        try:
+            report = OptimizerEngine().optimize_beam(self.beam)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.finished.emit(report)
@@ -1,13 +1,35 @@
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
 import numpy as np
-from app.models.entities import Beam, LoadType
+# Matplotlib é importado só ao plotar (caminhos da CLI que não geram gráficos não pagam o custo)
+from app.models.entities import Beam
+from app.engines._jit import NUMBA_AVAILABLE
+from app.engines import _diagram_kernels as kernels
+
+# A partir de quantos pontos por viga diagram_points usa o kernel compilado (com Numba)
+_JIT_MIN_POINTS = 5000
+
+# Resolução fixa da figura (também a das camadas rasterizadas ao salvar em PDF/SVG):
+# curvas, preenchimentos, setas e apoios viram bitmap; textos e eixos continuam vetoriais
+_DPI = 100
+
+# Gabarito do apoio na origem: triângulo (fechado) + hachura do chão, lado = 0.3
+_SUPPORT_SIZE = 0.3
+_SUPPORT_VERTS = np.array([
+    [0.0, 0.0], [-_SUPPORT_SIZE/2, -_SUPPORT_SIZE], [_SUPPORT_SIZE/2, -_SUPPORT_SIZE], [0.0, 0.0],
+    [-_SUPPORT_SIZE, -_SUPPORT_SIZE], [_SUPPORT_SIZE, -_SUPPORT_SIZE],
+])
+
+# Geometria das setas de carga distribuída (unidades do eixo do modelo estrutural)
+_LOAD_HEIGHT = 1.0
+_ARROW_SHAFT = 0.8
+_ARROW_HEAD_WIDTH = 0.1
+_ARROW_HEAD_LENGTH = 0.2
 
 class BeamPlotter:
     """
     Responsável por gerar a representação visual da viga e seus diagramas
     de esforços (DEC, DMF) e deslocamentos.
     """
+    _FONTS = None # FontProperties resolvidas uma vez e reaproveitadas entre plots (ver _fonts)
 
     @staticmethod
     def plot_results(beam: Beam, show=True, save_path=None):
@@ -17,51 +39,58 @@ class BeamPlotter:
         2. Diagrama de Esforço Cortante (DEC)
         3. Diagrama de Momento Fletor (DMF)
         """
-        # Configuração da Figura
-        fig, (ax_struc, ax_shear, ax_moment) = plt.subplots(3, 1, figsize=(10, 12), sharex=True)
-        plt.subplots_adjust(hspace=0.3)
+        # Configuração da Figura (a mesma é salva e, se pedido, exibida)
+        fig = BeamPlotter._new_figure(show)
+        try:
+            BeamPlotter._draw_results(fig, beam)
+            if save_path:
+                fig.savefig(save_path)
+                print(f"Gráfico salvo em: {save_path}")
+            if show:
+                import matplotlib.pyplot as plt
+                plt.show()
+        finally:
+            # Figuras do pyplot ficam registradas até plt.close: libera-as ao final (ou em erro),
+            # exceto no modo interativo, em que a janela continua aberta após o show()
+            if show:
+                import matplotlib.pyplot as plt
+                if not plt.isinteractive():
+                    plt.close(fig)
+
+    @staticmethod
+    def _draw_results(fig, beam: Beam):
+        """Cria os 3 subplots do plot_results na figura e os desenha (plot_into)."""
+        axes = fig.subplots(3, 1, sharex=True)
+        fig.subplots_adjust(hspace=0.3)
+        BeamPlotter.plot_into(axes, beam)
+
+    @staticmethod
+    def plot_into(axes, beam: Beam):
+        """
+        Desenha a viga em eixos já existentes (ax_struc, ax_shear, ax_moment), limpando-os antes.
+        Permite reaproveitar a mesma Figure (e o canvas) entre vigas/análises, sem recriá-la.
+        """
+        ax_struc, ax_shear, ax_moment = axes
+        for ax in axes:
+            ax.cla()
+            # Anotações de extremos guardadas no eixo (_annotate_extremes) saíram com o cla()
+            for attr in ("_ext_max", "_ext_min"):
+                if hasattr(ax, attr):
+                    delattr(ax, attr)
         
         # Título Geral
-        fig.suptitle(f"Análise Estrutural: {beam.id}", fontsize=16, fontweight='bold')
+        ax_struc.figure.suptitle(f"Análise Estrutural: {beam.id}", fontproperties=BeamPlotter._fonts()['suptitle'])
 
         # --- 1. Preparação dos Dados (Discretização) ---
-        # Concatenar todos os vãos para plotagem contínua
-        global_x = []
-        shear_y = []
-        moment_y = []
+        global_x, shear_y, moment_y = BeamPlotter.diagram_points(beam)
+        L = beam._span_L
+        node_x = np.concatenate(([0.0], np.cumsum(L))) # Posição X acumulada de cada nó
+        x_start = node_x[:-1] # Início de cada vão
         
-        current_x = 0.0
-        
-        for span in beam.spans:
-            # Criar pontos ao longo do vão (discretização fina para curvas)
-            L = span.length
-            x_local = np.linspace(0, L, 50)
-            x_global_span = current_x + x_local
-            
-            # Recuperar Esforços nos Nós (Calculados pelo Solver)
-            # Nota: Convenção de Resistência dos Materiais
-            V_esq = span.shear_left
-            M_esq = span.moment_left # Momento fletor (traciona fibra inf = positivo para cálculo, mas plotagem varia)
-            
-            # Carga Distribuída neste vão (Simplificação: Somatório de q)
-            q_total = sum([l.value for l in span.loads if l.load_type == LoadType.DISTRIBUTED])
-            
-            # Reconstruir equações ao longo do vão:
-            # V(x) = V_esq - q*x
-            # M(x) = M_esq + V_esq*x - (q*x^2)/2
-            
-            V_x = V_esq - q_total * x_local
-            M_x = M_esq + V_esq * x_local - (q_total * x_local**2) / 2
-            
-            # Armazenar
-            global_x.extend(x_global_span)
-            shear_y.extend(V_x)
-            moment_y.extend(M_x)
-            
-            # Desenhar Cargas e Apoios no ax_struc
-            BeamPlotter._draw_span_structure(ax_struc, current_x, L, q_total)
-            
-            current_x += L
+        # Desenhar Cargas no ax_struc (setas de todos os vãos acumuladas e desenhadas de uma vez)
+        arrow_x = [BeamPlotter._draw_span_structure(ax_struc, x0, length, q)
+                   for x0, length, q in zip(x_start.tolist(), L.tolist(), beam._span_q.tolist())]
+        BeamPlotter._draw_load_arrows(ax_struc, np.concatenate(arrow_x) if arrow_x else np.empty(0))
 
         # --- 2. Plotagem Estrutural (Topo) ---
         ax_struc.set_title("Modelo Estrutural e Carregamento")
@@ -69,16 +98,15 @@ class BeamPlotter:
         ax_struc.set_ylim(-5, 10) # Margem visual
         ax_struc.axhline(0, color='black', linewidth=3) # Viga
         
-        # Desenhar Apoios (Triângulos)
-        for i, node in enumerate(beam.nodes):
-            x_node = sum([s.length for s in beam.spans[:i]]) # Posição X acumulada
-            if node.support_conditions[1]: # Se restrito em Y
-                BeamPlotter._draw_support(ax_struc, x_node, 0)
+        # Desenhar Apoios (Triângulos + hachura do chão), todos num único artista
+        x_supports = np.array([x_node for node, x_node in zip(beam.nodes, node_x.tolist())
+                               if node.support_conditions[1]]) # Se restrito em Y
+        BeamPlotter._draw_supports(ax_struc, x_supports, 0.0)
 
         # --- 3. Diagrama de Cortante (DEC) ---
         ax_shear.set_title("Esforço Cortante (V) [kN]")
-        ax_shear.plot(global_x, shear_y, color='blue', linewidth=2)
-        ax_shear.fill_between(global_x, shear_y, 0, color='blue', alpha=0.1)
+        ax_shear.plot(global_x, shear_y, color='blue', linewidth=2, rasterized=True)
+        ax_shear.fill_between(global_x, shear_y, 0, color='blue', alpha=0.1, rasterized=True)
         ax_shear.axhline(0, color='black', linewidth=1)
         ax_shear.grid(True, linestyle='--', alpha=0.5)
         
@@ -88,56 +116,157 @@ class BeamPlotter:
         # --- 4. Diagrama de Momento (DMF) ---
         ax_moment.set_title("Momento Fletor (M) [kNm]")
         # Inverter eixo Y para convenção brasileira (Positivo para baixo)
-        ax_moment.invert_yaxis() 
-        ax_moment.plot(global_x, moment_y, color='red', linewidth=2)
-        ax_moment.fill_between(global_x, moment_y, 0, color='red', alpha=0.1)
+        if not ax_moment.yaxis_inverted(): # Eixo reaproveitado pode já estar invertido
+            ax_moment.invert_yaxis()
+        ax_moment.plot(global_x, moment_y, color='red', linewidth=2, rasterized=True)
+        ax_moment.fill_between(global_x, moment_y, 0, color='red', alpha=0.1, rasterized=True)
         ax_moment.axhline(0, color='black', linewidth=1)
         ax_moment.grid(True, linestyle='--', alpha=0.5)
         
         BeamPlotter._annotate_extremes(ax_moment, global_x, moment_y, unit="kNm")
 
         # Finalização
-        plt.xlabel("Comprimento (m)")
-        
-        if save_path:
-            plt.savefig(save_path)
-            print(f"Gráfico salvo em: {save_path}")
-        
+        ax_moment.set_xlabel("Comprimento (m)")
+
+    @staticmethod
+    def _new_figure(show):
+        """
+        Cria a Figure do plot_results. Com show=True ela é criada pelo pyplot (janela do
+        backend interativo); senão, é uma figura avulsa com canvas Agg, fora do pyplot
+        (não inicializa o backend interativo nem fica registrada para fechar depois).
+        """
         if show:
-            plt.show()
+            import matplotlib.pyplot as plt
+            return plt.figure(figsize=(10, 12), dpi=_DPI)
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        fig = Figure(figsize=(10, 12), dpi=_DPI)
+        FigureCanvasAgg(fig)
+        return fig
 
     @staticmethod
-    def _draw_support(ax, x, y):
-        # Triângulo representando apoio
-        size = 0.3
-        triangle = patches.Polygon(
-            [[x, y], [x - size/2, y - size], [x + size/2, y - size]], 
-            closed=True, color='black'
-        )
-        ax.add_patch(triangle)
-        # Hachura do chão
-        ax.plot([x - size, x + size], [y - size, y - size], color='black')
+    def diagram_points(beam: Beam, n_pts=50):
+        """
+        Discretiza V(x) e M(x) de todos os vãos de uma vez (n_pts pontos por vão).
+        Usa o espelho SoA da viga (esforços do Solver, q já consolidado); não depende do Matplotlib,
+        e é o que a GUI recalcula a cada edição antes de redesenhar só as curvas.
+        Retorna (x, V, M) contíguos, com x acumulado ao longo da viga.
+        """
+        # Nota: Convenção de Resistência dos Materiais
+        beam.ensure_soa()
+        L = beam._span_L
+        x_start = np.concatenate(([0.0], np.cumsum(L)[:-1])) # Início de cada vão
+
+        # Discretização fina: kernel compilado (sem os temporários (n_vãos, n_pts) do NumPy)
+        n_total = L.shape[0] * n_pts
+        if NUMBA_AVAILABLE and n_total >= _JIT_MIN_POINTS:
+            x, V, M = np.empty(n_total), np.empty(n_total), np.empty(n_total)
+            kernels.diagram_points(x_start, L, beam._span_q, beam._span_vl, beam._span_ml,
+                                   n_pts, x, V, M)
+            return x, V, M
+
+        q_total = beam._span_q[:, None] # Carga Distribuída por vão (Simplificação: Somatório de q)
+        V_esq = beam._span_vl[:, None]
+        M_esq = beam._span_ml[:, None] # Momento fletor (traciona fibra inf = positivo para cálculo, mas plotagem varia)
+
+        # V(x) = V_esq - q*x
+        # M(x) = M_esq + V_esq*x - (q*x^2)/2
+        x_local = np.linspace(0, L, n_pts, axis=1)
+        x = (x_start[:, None] + x_local).ravel()
+        V = (V_esq - q_total * x_local).ravel()
+        M = (M_esq + V_esq * x_local - 0.5 * q_total * x_local * x_local).ravel()
+        return x, V, M
+
+    @staticmethod
+    def _draw_supports(ax, x_supports, y):
+        """
+        Desenha todos os apoios de uma vez: o gabarito _SUPPORT_VERTS (triângulo + hachura
+        do chão) é deslocado para cada posição X e vira um único Path, num único PathPatch.
+        """
+        n = x_supports.shape[0]
+        if n == 0:
+            return
+        from matplotlib.path import Path
+        from matplotlib.patches import PathPatch
+        codes = np.array([Path.MOVETO, Path.LINETO, Path.LINETO, Path.CLOSEPOLY,
+                          Path.MOVETO, Path.LINETO], dtype=Path.code_type)
+        verts = _SUPPORT_VERTS[None, :, :] + np.column_stack((x_supports, np.full(n, y)))[:, None, :]
+        path = Path(verts.reshape(-1, 2), np.tile(codes, n))
+        ax.add_patch(PathPatch(path, facecolor='black', edgecolor='black', linewidth=1.5, rasterized=True))
 
     @staticmethod
     def _draw_span_structure(ax, x_start, length, q):
+        """Desenha a linha e o rótulo da carga distribuída; retorna as posições X das setas."""
         # Desenhar retângulo de carga distribuída
         if q > 0:
-            height = 1.0 # Altura visual da carga
-            # Setas para baixo
-            for x_arrow in np.linspace(x_start, x_start + length, int(length*2) + 2):
-                ax.arrow(x_arrow, height, 0, -0.8, head_width=0.1, head_length=0.2, fc='blue', ec='blue')
+            height = _LOAD_HEIGHT # Altura visual da carga
             # Linha superior da carga
             ax.plot([x_start, x_start + length], [height, height], color='blue')
             ax.text(x_start + length/2, height + 0.2, f"q = {q:.1f} kN/m", ha='center', color='blue')
+            # Setas para baixo (desenhadas por _draw_load_arrows)
+            return np.linspace(x_start, x_start + length, int(length*2) + 2)
+        return np.empty(0)
+
+    @staticmethod
+    def _draw_load_arrows(ax, x_arrows):
+        """
+        Setas da carga distribuída: hastes numa LineCollection e pontas numa PolyCollection
+        (dois artistas no total, em vez de um FancyArrow por seta). Mesma geometria de
+        ax.arrow(x, 1.0, 0, -0.8, head_width=0.1, head_length=0.2).
+        """
+        if x_arrows.shape[0] == 0:
+            return
+        from matplotlib.collections import LineCollection, PolyCollection
+        n = x_arrows.shape[0]
+        y_head = _LOAD_HEIGHT - _ARROW_SHAFT # Base da ponta
+        half = _ARROW_HEAD_WIDTH / 2
+
+        shafts = np.empty((n, 2, 2))
+        shafts[:, :, 0] = x_arrows[:, None]
+        shafts[:, 0, 1] = _LOAD_HEIGHT
+        shafts[:, 1, 1] = y_head
+
+        heads = np.empty((n, 3, 2))
+        heads[:, 0, 0] = x_arrows - half
+        heads[:, 1, 0] = x_arrows + half
+        heads[:, 2, 0] = x_arrows
+        heads[:, :2, 1] = y_head
+        heads[:, 2, 1] = y_head - _ARROW_HEAD_LENGTH
+
+        ax.add_collection(LineCollection(shafts, colors='blue', linewidths=1.0, rasterized=True))
+        ax.add_collection(PolyCollection(heads, facecolors='blue', edgecolors='blue', linewidths=1.0, rasterized=True))
+
+    @staticmethod
+    def _fonts():
+        """
+        Fontes dos textos do plot (criadas no 1º plot, com o rcParams vigente):
+        'suptitle' (16, negrito) e 'bold' (tamanho padrão, negrito) das anotações de extremos.
+        """
+        if BeamPlotter._FONTS is None:
+            from matplotlib.font_manager import FontProperties
+            BeamPlotter._FONTS = {
+                'suptitle': FontProperties(size=16, weight='bold'),
+                'bold': FontProperties(weight='bold'),
+            }
+        return BeamPlotter._FONTS
 
     @staticmethod
     def _annotate_extremes(ax, x, y, unit):
-        # Anota valores máximos e mínimos
-        y = np.array(y)
-        ymax_idx = np.argmax(y)
-        ymin_idx = np.argmin(y)
+        """
+        Anota valores máximos e mínimos. x e y: arrays NumPy (os de diagram_points, sem cópia).
+        As duas anotações ficam guardadas no eixo (ax._ext_max / ax._ext_min): se o mesmo
+        eixo for anotado de novo, só posição e texto são atualizados, sem criar artistas.
+        """
+        ymax_idx = y.argmax()
+        ymin_idx = y.argmin()
         
-        ax.annotate(f"{y[ymax_idx]:.1f}", xy=(x[ymax_idx], y[ymax_idx]), 
-                    xytext=(0, 10), textcoords="offset points", ha='center', fontweight='bold')
-        ax.annotate(f"{y[ymin_idx]:.1f}", xy=(x[ymin_idx], y[ymin_idx]), 
-                    xytext=(0, -15), textcoords="offset points", ha='center', fontweight='bold')
\ No newline at end of file
+        bold = BeamPlotter._fonts()['bold']
+        for attr, idx, offset in (("_ext_max", ymax_idx, (0, 10)), ("_ext_min", ymin_idx, (0, -15))):
+            xy = (x[idx], y[idx])
+            ann = getattr(ax, attr, None)
+            if ann is None:
+                setattr(ax, attr, ax.annotate(f"{y[idx]:.1f}", xy=xy, xytext=offset,
+                                              textcoords="offset points", ha='center', fontproperties=bold))
+            else:
+                ann.xy = xy
+                ann.set_text(f"{y[idx]:.1f}")
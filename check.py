@@ -1,6 +1,20 @@
 import os
 import sys
 
+def _scan_dir(directory):
+    """
+    Lê o diretório uma única vez (os.scandir): {nome em minúsculas: [nomes reais]}.
+    Retorna None se o diretório não existir.
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = {}
+            for entry in it:
+                entries.setdefault(entry.name.lower(), []).append(entry.name)
+            return entries
+    except OSError:
+        return None
+
 def check_structure():
     print("=== DIAGNÓSTICO DE ESTRUTURA DO PROJETO ===\n")
     
@@ -8,8 +22,16 @@ def check_structure():
     cwd = os.getcwd()
     print(f"Diretório de Execução (CWD): {cwd}")
     
+    # Conteúdo de cada diretório consultado (um scandir por diretório)
+    listings = {}
+    def entries_of(directory):
+        if directory not in listings:
+            listings[directory] = _scan_dir(directory)
+        return listings[directory]
+
     # 2. Verificar Conflitos na Raiz
-    if os.path.exists("app.py"):
+    root_entries = entries_of(".") or {}
+    if "app.py" in root_entries.get("app.py", ()):
         print("\n[CRÍTICO] ❌ ALERTA DE CONFLITO:")
         print("   Existe um arquivo 'app.py' na raiz. O Python irá carregar este ARQUIVO")
         print("   ao invés da PASTA 'app/'. Renomeie ou apague 'app.py'.")
@@ -28,7 +50,11 @@ def check_structure():
     all_ok = True
     
     for path, type_ in required_paths:
-        exists = os.path.exists(path)
+        directory = os.path.dirname(path) or "."
+        filename = os.path.basename(path)
+        entries = entries_of(directory)
+        same_name = entries.get(filename.lower(), []) if entries is not None else []
+        exists = filename in same_name
         icon = "✅" if exists else "❌"
         status = "Encontrado" if exists else "AUSENTE"
         print(f"   {icon} {path:<20} [{type_}]: {status}")
@@ -36,15 +62,9 @@ def check_structure():
         if not exists:
             all_ok = False
             # Checagem extra de Case Sensitivity (ex: App vs app)
-            directory = os.path.dirname(path) or "."
-            filename = os.path.basename(path)
-            if os.path.exists(directory):
-                items = os.listdir(directory)
-                # Procura por nomes parecidos (ignorando case)
-                for item in items:
-                    if item.lower() == filename.lower() and item != filename:
-                        print(f"      ⚠️  AVISO: Encontrado '{item}' mas o código procura '{filename}'.")
-                        print(f"          O Linux diferencia maiúsculas de minúsculas!")
+            for item in same_name:
+                print(f"      ⚠️  AVISO: Encontrado '{item}' mas o código procura '{filename}'.")
+                print(f"          O Linux diferencia maiúsculas de minúsculas!")
 
     if all_ok:
         print("\n✅ A estrutura de arquivos parece correta.")
@@ -1,5 +1,6 @@
 import sys
 import os
+import logging
 
 # Correção de Path para encontrar o pacote 'app'
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -13,6 +14,11 @@ def main():
     """
     Ponto de entrada para a Interface Gráfica (GUI).
     """
+    # Relatórios e avisos dos motores são emitidos via logging (nível INFO do pacote 'app';
+    # WARNING mantém só os avisos, ERROR silencia o lote)
+    logging.basicConfig(level=logging.WARNING, format="%(message)s", stream=sys.stdout)
+    logging.getLogger("app").setLevel(logging.INFO)
+
     app = QApplication(sys.argv)
     
     # Estilo Fusion para aparência moderna e consistente em todos os OS
@@ -1,5 +1,6 @@
 import sys
 import os
+import logging
 
 # --- CORREÇÃO DE PATH (CRÍTICO) ---
 # Adiciona o diretório atual (raiz do projeto) ao sys.path.
@@ -9,22 +10,37 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 # ----------------------------------
 
-# Agora a importação deve funcionar sem problemas
-try:
-    from app.ui.cli import CommandLineInterface
-except ImportError as e:
-    # Diagnóstico de erro caso a importação falhe
-    print(f"[ERRO DE IMPORTAÇÃO] Não foi possível encontrar o módulo 'app'.")
-    print(f"Diretório atual: {os.getcwd()}")
-    print(f"sys.path: {sys.path}")
-    print(f"Detalhes do erro: {e}")
-    sys.exit(1)
+def _import_cli():
+    """
+    Importa a CLI só depois da leitura dos argumentos: `main.py -h` não carrega o pacote 'app'.
+    """
+    try:
+        from app.ui.cli import CommandLineInterface
+    except ImportError as e:
+        # Diagnóstico de erro caso a importação falhe
+        print(f"[ERRO DE IMPORTAÇÃO] Não foi possível encontrar o módulo 'app'.")
+        print(f"Diretório atual: {os.getcwd()}")
+        print(f"sys.path: {sys.path}")
+        print(f"Detalhes do erro: {e}")
+        sys.exit(1)
+    return CommandLineInterface
 
 def main():
     """
     Ponto de entrada principal do PyViga.
     Inicia a Interface de Linha de Comando (CLI).
     """
+    import argparse
+    parser = argparse.ArgumentParser(description="PyViga - Dimensionamento de vigas de concreto armado (CLI interativa).")
+    parser.parse_args()
+
+    CommandLineInterface = _import_cli()
+
+    # Relatórios e avisos dos motores são emitidos via logging (nível INFO do pacote 'app';
+    # WARNING mantém só os avisos, ERROR silencia o lote)
+    logging.basicConfig(level=logging.WARNING, format="%(message)s", stream=sys.stdout)
+    logging.getLogger("app").setLevel(logging.INFO)
+
     try:
         app = CommandLineInterface()
         app.run()